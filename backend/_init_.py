@@ -1,11 +1,21 @@
 from textual.app import App, ComposeResult
 from textual.containers import Vertical, Horizontal
 from textual.widgets import Header, Footer, Button, DataTable, Label, Input, Static
-import requests
+import httpx
 import json
 
 API_URL = "http://127.0.0.1:8000/api"  # Ensure your Flask API is running
 
+PAGE_SIZE = 200
+LOAD_AHEAD = 20  # fetch the next page when the cursor gets this close to the last row
+ITEM_COLUMNS = [
+    ("itemId", "Item ID"), ("name", "Name"), ("preferredZone", "Zone"),
+    ("priority", "Priority"), ("status", "Status")
+]
+LOG_COLUMNS = [
+    ("timestamp", "Timestamp"), ("actionType", "Action"), ("itemId", "Item ID"), ("details", "Details")
+]
+
 class CargoManagerTUI(App):
     """🚀 Interactive Cargo Manager for ISS"""
 
@@ -42,8 +52,79 @@ class CargoManagerTUI(App):
 
     async def on_mount(self):
         """Setup UI elements when the app starts"""
+        # One pooled client for the whole session; requests never block the UI thread
+        self.client = httpx.AsyncClient(
+            base_url=API_URL,
+            timeout=httpx.Timeout(10.0, connect=3.0),
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=5)
+        )
         self.table = self.query_one("#data_table", DataTable)
-        self.table.add_columns("Item ID", "Name", "Zone", "Priority", "Status")
+        self.mode = None
+        self.rows = {}  # itemId -> displayed cell values
+        self.next_cursor = None
+        self.loading = False
+        self._set_mode("items")
+
+    async def on_unmount(self):
+        await self.client.aclose()
+
+    def _set_mode(self, mode):
+        """Switch the table columns between items and logs"""
+        if mode == self.mode:
+            return
+        self.mode = mode
+        self.rows = {}
+        self.next_cursor = None
+        self.table.clear(columns=True)
+        for key, label in (LOG_COLUMNS if mode == "logs" else ITEM_COLUMNS):
+            self.table.add_column(label, key=key)
+
+    @staticmethod
+    def _item_cells(item):
+        return (
+            item["itemId"], item["name"], item.get("preferredZone", "Unknown"),
+            str(item["priority"]), item.get("status", "available")
+        )
+
+    async def _fetch_items_page(self, cursor=None):
+        params = {"limit": PAGE_SIZE, "fields": ",".join(key for key, _ in ITEM_COLUMNS)}
+        if cursor:
+            params["cursor"] = cursor
+        response = await self.client.get("/items", params=params)
+        response.raise_for_status()
+        return response.json()
+
+    def _apply_items(self, items):
+        """Add new rows and update only the cells that changed"""
+        for item in items:
+            cells = self._item_cells(item)
+            key = item["itemId"]
+            old = self.rows.get(key)
+            if old is None:
+                self.table.add_row(*cells, key=key)
+            elif old != cells:
+                for (column, _), before, after in zip(ITEM_COLUMNS, old, cells):
+                    if before != after:
+                        self.table.update_cell(key, column, after)
+            self.rows[key] = cells
+
+    async def load_more_items(self):
+        """Append the next page when the user scrolls near the end"""
+        if self.loading or not self.next_cursor or self.mode != "items":
+            return
+        self.loading = True
+        try:
+            page = await self._fetch_items_page(self.next_cursor)
+            self._apply_items(page.get("data", []))
+            self.next_cursor = page.get("nextCursor")
+        except httpx.HTTPError as e:
+            self.notify(f"❌ Error: {str(e)}", severity="error")
+        finally:
+            self.loading = False
+
+    async def on_data_table_row_highlighted(self, event: DataTable.RowHighlighted):
+        if event.cursor_row >= self.table.row_count - LOAD_AHEAD:
+            await self.load_more_items()
 
     async def on_button_pressed(self, event: Button.Pressed):
         """Handle button clicks"""
@@ -63,24 +144,40 @@ class CargoManagerTUI(App):
     async def update_table(self, mode: str):
         """Fetch and update table with cargo or logs"""
         print(f"📡 Fetching {mode}...")  # Debugging
-        self.table.clear()
-        endpoint = "logs" if mode == "logs" else "items"
+        self._set_mode("logs" if mode == "logs" else "items")
         try:
-            response = requests.get(f"{API_URL}/{endpoint}").json()
-            if response.get("success"):
+            if mode == "logs":
+                response = (await self.client.get("/logs")).json()
+                if not response.get("success"):
+                    self.notify("❌ Failed to fetch data!", severity="error")
+                    return
+                self.table.clear()
                 for item in response.get("data", []):
-                    if mode == "logs":
-                        self.table.add_row(
-                            item["timestamp"], item["actionType"],
-                            item["itemId"], json.dumps(item["details"])
-                        )
-                    else:
-                        self.table.add_row(
-                            item["itemId"], item["name"], item.get("preferredZone", "Unknown"),
-                            str(item["priority"]), item.get("status", "available")
-                        )
-            else:
-                self.notify("❌ Failed to fetch data!", severity="error")
+                    self.table.add_row(
+                        item["timestamp"], item["actionType"],
+                        item["itemId"], json.dumps(item["details"])
+                    )
+                return
+
+            # Refresh the pages already on screen, then drop rows that disappeared
+            seen = set()
+            cursor = None
+            while True:
+                page = await self._fetch_items_page(cursor)
+                if not page.get("success"):
+                    self.notify("❌ Failed to fetch data!", severity="error")
+                    return
+                items = page.get("data", [])
+                self._apply_items(items)
+                seen.update(item["itemId"] for item in items)
+                cursor = page.get("nextCursor")
+                if not cursor or len(seen) >= len(self.rows):
+                    break
+            self.next_cursor = cursor
+            last_seen = max(seen) if seen else None
+            for key in [k for k in self.rows if k not in seen and (cursor is None or k <= last_seen)]:
+                self.table.remove_row(key)
+                del self.rows[key]
         except Exception as e:
             self.notify(f"❌ Error: {str(e)}", severity="error")
 
@@ -118,7 +215,7 @@ class CargoManagerTUI(App):
         }
 
         try:
-            response = requests.post(f"{API_URL}/add", json=data).json()
+            response = (await self.client.post("/add", json=data)).json()
             self.notify(response.get("message", "✅ Cargo Added!"), severity="info")
             await self.update_table("items")  # Refresh table
         except Exception as e:
@@ -142,7 +239,7 @@ class CargoManagerTUI(App):
             return
 
         try:
-            response = requests.post(f"{API_URL}/retrieve", json={"id": id_input}).json()
+            response = (await self.client.post("/retrieve", json={"id": id_input})).json()
             if response.get("success"):
                 self.notify(response.get("message", "📦 Item Retrieved!"), severity="success")
             else:
@@ -169,7 +266,7 @@ class CargoManagerTUI(App):
             return
 
         try:
-            response = requests.post(f"{API_URL}/waste", json={"id": id_input}).json()
+            response = (await self.client.post("/waste", json={"id": id_input})).json()
             if response.get("success"):
                 self.notify(response.get("message", "🚮 Item Marked as Waste!"), severity="warning")
             else:
@@ -3,16 +3,27 @@ Optimization algorithms package
 
 Contains:
 - PriorityBinPacker: 3D bin packing algorithm
+- ZonePartitionedPacker: per-zone packing in worker processes
 - RetrievalPathFinder: Item retrieval path calculation
 - WasteOptimizer: Waste management optimization
+- placement_job: placement run with progress reporting, for job workers
+- snapshots: memory-mapped occupancy snapshots for fast restarts
 """
 
 from .bin_packing import PriorityBinPacker
+from .partitioned import ZonePartitionedPacker
 from .pathfinding import RetrievalPathFinder
 from .waste_opt import WasteOptimizer
+from .placement_job import run_placement_job
+from .snapshots import save_snapshot, load_snapshot, restore_spaces
 
 __all__ = [
     'PriorityBinPacker',
+    'ZonePartitionedPacker',
     'RetrievalPathFinder',
-    'WasteOptimizer'
+    'WasteOptimizer',
+    'save_snapshot',
+    'load_snapshot',
+    'restore_spaces',
+    'run_placement_job'
 ]
\ No newline at end of file
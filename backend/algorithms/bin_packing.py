@@ -1,53 +1,303 @@
 import numpy as np
+import time
+from math import ceil, floor
 from heapq import heappush, heappop
-from collections import deque
+from bisect import bisect_left
+from collections import OrderedDict, deque
 from functools import lru_cache
+from itertools import chain, combinations, permutations
+
+COARSE_BLOCK = 8           # fine cells per coarse block edge
+COARSE_MIN_CELLS = 32768   # boxes smaller than this skip the coarse summary
+SCORING_MODES = ('depth', 'balance')
+# Balance scoring only: long free-space scans test chunks of origins against summed-volume tables
+TABLE_MAX_CELLS = 1 << 21   # larger grids keep the per-candidate scan
+TABLE_CACHE_CELLS = 1 << 23  # table cells a packer keeps between scans (4 bytes each)
+SCAN_PROBE = 16   # candidates checked one by one before switching to chunks
+SCAN_CHUNK = 256
+_EPS = 1e-9
 
 class ContainerSpace:
-    """Optimized 3D container space management with collision detection"""
+    """Optimized 3D container space management with collision detection
+
+    The fine grid has one cell per `resolution` units. A coarse summary counts the
+    occupied cells in every block x block x block region, so most collision checks are
+    answered from the summary without touching the fine grid.
+    """
     
-    def __init__(self, width, depth, height):
-        self.dims = (int(width), int(depth), int(height))
+    def __init__(self, width, depth, height, max_mass=None, resolution=1.0, block=COARSE_BLOCK):
+        self.resolution = float(resolution)
+        self.dims = self.grid_dims(width, depth, height, self.resolution)
         self.occupancy = np.zeros(self.dims, dtype=bool)
         self.items = {}
+        self._init_summary(max_mass, block)
+    
+    @classmethod
+    def from_grid(cls, occupancy, items, masses=None, max_mass=None, resolution=1.0, block=COARSE_BLOCK):
+        """Wrap an existing occupancy grid (e.g. a memory-mapped snapshot) without copying it"""
+        space = cls.__new__(cls)
+        space.resolution = float(resolution)
+        space.dims = tuple(int(d) for d in occupancy.shape)
+        space.occupancy = occupancy
+        space.items = dict(items)
+        space._init_summary(max_mass, block)
+        space.masses = dict(masses or {})
+        space.total_mass = sum(space.masses.values())
+        space.used_volume = sum(p[3] * p[4] * p[5] for p in space.items.values())
+        for item_id, position in space.items.items():
+            space._add_moment(position, space.masses.get(item_id, 0), 1)
+        return space
+
+    @staticmethod
+    def grid_dims(width, depth, height, resolution=1.0):
+        """Number of whole cells along each axis for a container of the given size"""
+        return tuple(int(floor(float(v) / resolution + _EPS)) for v in (width, depth, height))
+
+    def voxels(self, length):
+        """Cells needed to hold length units (rounded up, so items never shrink)"""
+        return max(1, int(ceil(float(length) / self.resolution - _EPS)))
+
+    def to_units(self, position):
+        """Convert a cell position (x, y, z, w, d, h) to container units"""
+        return tuple(v * self.resolution for v in position)
+
+    def from_units(self, position):
+        """Convert a unit position to cells: origins round down, extents round up"""
+        x, y, z, w, d, h = position
+        origin = tuple(int(floor(float(v) / self.resolution + _EPS)) for v in (x, y, z))
+        return origin + tuple(self.voxels(v) for v in (w, d, h))
+
+    def _init_summary(self, max_mass, block=COARSE_BLOCK):
+        """Running totals used to reject containers before any grid work"""
+        self.max_mass = max_mass
+        self.block = block
+        self._coarse = None      # occupied cells per block, built on first use
+        self._capacity = None    # cells per block (edge blocks are smaller)
+        self.masses = {}
+        self.total_mass = 0
+        self.used_volume = 0
+        self.moment = [0.0, 0.0, 0.0]  # sum of mass * item centre per axis
+        self.version = 0    # bumped on every change
+        self.removals = 0   # bumped only when space is freed
+        self._extent = (None, None)
         
-    def add_item(self, item_id, position):
+    def add_item(self, item_id, position, mass=0):
         x, y, z, w, d, h = position
         if self._check_collision(x, y, z, w, d, h):
             return False
         self.occupancy[x:x+w, y:y+d, z:z+h] = True
+        self._update_coarse(x, y, z, w, d, h, 1)
         self.items[item_id] = position
+        self.masses[item_id] = mass
+        self.total_mass += mass
+        self._add_moment(position, mass, 1)
+        self.used_volume += w * d * h
+        self.version += 1
         return True
     
     def remove_item(self, item_id):
         position = self.items.pop(item_id)
         x, y, z, w, d, h = position
         self.occupancy[x:x+w, y:y+d, z:z+h] = False
+        self._update_coarse(x, y, z, w, d, h, -1)
+        mass = self.masses.pop(item_id, 0)
+        self.total_mass -= mass
+        self._add_moment(position, mass, -1)
+        self.used_volume -= w * d * h
+        self.version += 1
+        self.removals += 1
         return position
+
+    def _add_moment(self, position, mass, sign):
+        if mass:
+            x, y, z, w, d, h = position
+            self.moment[0] += sign * mass * (x + w / 2)
+            self.moment[1] += sign * mass * (y + d / 2)
+            self.moment[2] += sign * mass * (z + h / 2)
+
+    def center_of_mass(self):
+        """Centre of mass in cells, or None while the container holds no mass"""
+        if self.total_mass <= 0:
+            return None
+        return tuple(m / self.total_mass for m in self.moment)
+
+    def imbalance(self, extra_mass=0, extra_centers=None):
+        """Distance of the centre of mass from the geometric centre, per axis scaled to 0..0.5
+
+        With extra_mass and an (n, 3) array of extra_centers, returns the imbalance after
+        adding that mass at each centre, for a whole batch of candidates at once.
+        """
+        dims = np.asarray(self.dims, dtype=float)
+        moment = np.asarray(self.moment)
+        mass = self.total_mass
+        if extra_centers is not None:
+            moment = moment + extra_mass * np.asarray(extra_centers, dtype=float)
+            mass = mass + extra_mass
+        if mass <= 0:
+            return np.zeros(len(extra_centers)) if extra_centers is not None else 0.0
+        offset = (moment / mass - dims / 2) / dims
+        return np.sqrt((offset ** 2).sum(axis=-1))
+
+    @property
+    def remaining_volume(self):
+        return self.occupancy.size - self.used_volume
+
+    @property
+    def remaining_mass(self):
+        return np.inf if self.max_mass is None else self.max_mass - self.total_mass
+
+    def max_free_extent(self):
+        """Upper bound on the longest free run along each axis, recomputed only after changes"""
+        version, extent = self._extent
+        if version != self.version:
+            free = ~self.occupancy
+            extent = tuple(int(free.sum(axis=axis).max()) if free.size else 0 for axis in range(3))
+            self._extent = (self.version, extent)
+        return extent
+
+    def can_hold(self, volume, mass=0):
+        """Cheap volume and mass check before any geometric search"""
+        return volume <= self.remaining_volume and mass <= self.remaining_mass
+
+    def may_fit(self, w, d, h):
+        """False when an orientation exceeds the container or its largest free run"""
+        fx, fy, fz = self.max_free_extent()
+        return w <= fx and d <= fy and h <= fz
+
+    def summary(self):
+        return {
+            'remainingVolume': int(self.remaining_volume),
+            'remainingMass': None if self.max_mass is None else float(self.remaining_mass),
+            'centerOfMass': self.center_of_mass(),
+            'imbalance': float(self.imbalance()),
+            'maxFreeExtent': list(self.max_free_extent()),
+            'items': len(self.items)
+        }
     
+    def _build_coarse(self):
+        """Count occupied cells per block in one pass over the fine grid"""
+        starts = [np.arange(0, n, self.block) for n in self.dims]
+        counts = self.occupancy.astype(np.int32)
+        for axis, idx in enumerate(starts):
+            counts = np.add.reduceat(counts, idx, axis=axis) if len(idx) else counts
+        self._coarse = counts
+        sizes = [np.diff(np.append(idx, n)) for idx, n in zip(starts, self.dims)]
+        self._capacity = sizes[0][:, None, None] * sizes[1][None, :, None] * sizes[2][None, None, :]
+
+    def _block_overlap(self, lo, length, axis):
+        """First/last block touched by [lo, lo + length) on axis, and the cells in each"""
+        hi = min(self.dims[axis], lo + length)
+        lo = max(0, lo)
+        b0, b1 = lo // self.block, (hi - 1) // self.block + 1
+        edges = np.arange(b0, b1 + 1) * self.block
+        return b0, b1, np.minimum(edges[1:], hi) - np.maximum(edges[:-1], lo)
+
+    def _update_coarse(self, x, y, z, w, d, h, sign):
+        if self._coarse is None or w <= 0 or d <= 0 or h <= 0:
+            return
+        bx0, bx1, ox = self._block_overlap(x, w, 0)
+        by0, by1, oy = self._block_overlap(y, d, 1)
+        bz0, bz1, oz = self._block_overlap(z, h, 2)
+        self._coarse[bx0:bx1, by0:by1, bz0:bz1] += sign * (
+            ox[:, None, None] * oy[None, :, None] * oz[None, None, :])
+
     def _check_collision(self, x, y, z, w, d, h):
-        """Efficient collision check using numpy slicing"""
-        return np.any(self.occupancy[
-            max(0, x):min(self.dims[0], x+w),
-            max(0, y):min(self.dims[1], y+d),
-            max(0, z):min(self.dims[2], z+h)
-        ])
+        """Collision check that consults the coarse summary before the fine grid"""
+        x0, y0, z0 = max(0, x), max(0, y), max(0, z)
+        x1, y1, z1 = min(self.dims[0], x+w), min(self.dims[1], y+d), min(self.dims[2], z+h)
+        if x1 <= x0 or y1 <= y0 or z1 <= z0:
+            return False
+        if (x1 - x0) * (y1 - y0) * (z1 - z0) < COARSE_MIN_CELLS:
+            # Small boxes are cheaper to test on the fine grid directly
+            return bool(self.occupancy[x0:x1, y0:y1, z0:z1].any())
+        if self._coarse is None:
+            self._build_coarse()
+        b = self.block
+        blocks = (slice(x0 // b, (x1 - 1) // b + 1),
+                  slice(y0 // b, (y1 - 1) // b + 1),
+                  slice(z0 // b, (z1 - 1) // b + 1))
+        counts = self._coarse[blocks]
+        if not counts.any():
+            return False  # every touched block is empty
+        if (counts == self._capacity[blocks]).any():
+            return True   # some touched block is full
+        return bool(np.any(self.occupancy[x0:x1, y0:y1, z0:z1]))
+    
+    def summed_table(self):
+        """Summed-volume table of the occupancy grid (4 bytes per cell, so 4x the grid)"""
+        W, D, H = self.dims
+        table = np.zeros((W + 1, D + 1, H + 1), dtype=np.int32)
+        table[1:, 1:, 1:] = self.occupancy.cumsum(0, dtype=np.int32).cumsum(1).cumsum(2)
+        return table
+
+    def fits_at(self, origins, w, d, h, table=None):
+        """Mask of the (n, 3) origins where a w x d x h box is inside and collision-free"""
+        x, y, z = np.asarray(origins).T
+        W, D, H = self.dims
+        mask = (x + w <= W) & (y + d <= D) & (z + h <= H)
+        x, y, z = x[mask], y[mask], z[mask]
+        t = self.summed_table() if table is None else table
+        occupied = (t[x + w, y + d, z + h] - t[x, y + d, z + h] - t[x + w, y, z + h] - t[x + w, y + d, z]
+                    + t[x, y, z + h] + t[x, y + d, z] + t[x + w, y, z] - t[x, y, z])
+        mask[mask] = occupied == 0
+        return mask
+
+    def free_positions(self, w, d, h, table=None):
+        """All collision-free origins for a w x d x h box, front-most (lowest depth) first
+
+        Uses a summed-volume table so every origin is tested in one vectorized pass;
+        pass table to reuse one already built for the current occupancy.
+        """
+        w, d, h = int(w), int(d), int(h)
+        W, D, H = self.dims
+        if w <= 0 or d <= 0 or h <= 0 or w > W or d > D or h > H:
+            return np.empty((0, 3), dtype=int)
+        if table is None:
+            table = self.summed_table()
+        nx, ny, nz = W - w + 1, D - d + 1, H - h + 1
+
+        def t(x0, y0, z0):
+            return table[x0:x0 + nx, y0:y0 + ny, z0:z0 + nz]
+
+        occupied = (t(w, d, h) - t(0, d, h) - t(w, 0, h) - t(w, d, 0)
+                    + t(0, 0, h) + t(0, d, 0) + t(w, 0, 0) - t(0, 0, 0))
+        xs, ys, zs = np.nonzero(occupied == 0)
+        order = np.lexsort((zs, xs, ys))  # depth first, then width, then height
+        return np.stack((xs[order], ys[order], zs[order]), axis=1)
 
 class PriorityBinPacker:
     """Priority-based 3D bin packing with accessibility optimization"""
     
-    def __init__(self, containers):
+    def __init__(self, containers, rearrangement_time_budget=0.5, max_rearrangement_moves=3, resolution=1.0,
+                 scoring='depth', balance_weight=25.0, balance_candidates=256, rearrangement_total_budget=2.0):
+        if scoring not in SCORING_MODES:
+            raise ValueError(f"Unknown scoring mode '{scoring}', expected one of {SCORING_MODES}")
+        # 'balance' also penalizes moving a container's centre of mass off-centre
+        self.scoring = scoring
+        self.balance_weight = balance_weight
+        self.balance_candidates = balance_candidates
+        # Seconds of rearrangement search per unplaced item, and in total per pack_items call
+        self.rearrangement_time_budget = rearrangement_time_budget
+        self.rearrangement_total_budget = rearrangement_total_budget
+        self._rearrangement_left = rearrangement_total_budget
+        self.max_rearrangement_moves = max_rearrangement_moves
         self.containers = {
             c['containerId']: {
-                'space': ContainerSpace(c['width'], c['depth'], c['height']),
+                'space': ContainerSpace(c['width'], c['depth'], c['height'], max_mass=c.get('maxWeight'),
+                                        resolution=c.get('resolution', resolution)),
                 'metadata': c,
-                'free_space': deque()
+                'free_space': []
             } for c in containers
         }
+        # (containerId, w, d, h) -> {'hint': first origin worth scanning, 'removals': space.removals}
+        # While nothing is removed occupancy only grows, so earlier origins (and failures) stay invalid
+        self._shape_cache = {}
+        # containerId -> (space version, summed table), least recently used first
+        self._tables = OrderedDict()
         self._init_free_spaces()
         
     def _init_free_spaces(self):
-        """Precompute initial free spaces for faster packing"""
+        """Precompute initial free spaces for faster packing (kept sorted as (y, x, z))"""
         for cid, container in self.containers.items():
             space = container['space']
             container['free_space'].extend(
@@ -57,69 +307,402 @@ class PriorityBinPacker:
                 for z in range(space.dims[2])
             )
 
-    def pack_items(self, items):
-        """Pack items with priority and accessibility optimization"""
+    def load_spaces(self, spaces):
+        """Swap in pre-built ContainerSpaces (e.g. restored snapshots) and prune their free space"""
+        for cid, space in spaces.items():
+            if cid not in self.containers:
+                continue
+            container = self.containers[cid]
+            container['space'] = space
+            container['free_space'] = [
+                (y, x, z) for y, x, z in container['free_space']
+                if x < space.dims[0] and y < space.dims[1] and z < space.dims[2]
+                and not space.occupancy[x, y, z]
+            ]
+        self._shape_cache.clear()
+        self._tables.clear()
+
+    def container_summaries(self):
+        """Remaining volume/mass, largest free runs and zone for every container"""
+        return {
+            cid: {**c['space'].summary(), 'zone': c['metadata']['zone']}
+            for cid, c in self.containers.items()
+        }
+
+    def pack_items(self, items, block_building=False):
+        """Pack items with priority and accessibility optimization
+
+        With block_building, runs of identical items (same dimensions, priority and
+        zone) are placed as layered grids in one step instead of one search each.
+        Rearrangements are suggested for items that do not fit until the call has spent
+        rearrangement_total_budget seconds on them; later overflow gets no suggestion.
+        """
+        self._rearrangement_left = self.rearrangement_total_budget
         sorted_items = sorted(items, key=lambda x: (
             -x['priority'], 
-            x['width'] * x['depth'] * x['height']
+            x['width'] * x['depth'] * x['height'],
+            x['width'], x['depth'], x['preferredZone']
         ))
+        if block_building:
+            yield from self._pack_blocks(sorted_items)
+            return
         
         for item in sorted_items:
-            best = {'score': -np.inf, 'placement': None}
-            
-            for cid, container in self.containers.items():
-                zone_bonus = 2 if container['metadata']['zone'] == item['preferredZone'] else -2
-                
-                for orientation in self.get_orientations(item):
-                    position = self.find_optimal_position(container, orientation)
-                    if position:
-                        score = self._calculate_score(position, item['priority'], zone_bonus)
-                        if score > best['score']:
-                            best = {'cid': cid, 'pos': position, 'score': score}
+            yield self._pack_one(item)
+
+    def _pack_one(self, item):
+        """Place a single item at its best-scoring position, or suggest rearrangements"""
+        best = {'score': -np.inf, 'placement': None}
+        mass = item.get('mass', 0)
+        
+        for cid, container in self.containers.items():
+            space = container['space']
+            orientations = self._orientations(space, item)
+            # Skip containers that plainly can't take the item (volume, maxWeight)
+            if not space.can_hold(np.prod(orientations[0]), mass):
+                continue
+            zone_bonus = 2 if container['metadata']['zone'] == item['preferredZone'] else -2
             
-            if best['score'] != -np.inf:
-                container = self.containers[best['cid']]
-                if container['space'].add_item(item['itemId'], best['pos']):
-                    self._update_free_space(container, best['pos'])
-                    yield {'item': item, 'container': best['cid'], 'position': best['pos']}
-            else:
-                yield {'rearrangements': self.suggest_rearrangements(item)}
+            for orientation in orientations:
+                if not space.may_fit(*orientation):
+                    continue
+                position = self.find_optimal_position(container, orientation)
+                if position:
+                    score = self._calculate_score(position, item['priority'], zone_bonus)
+                    if score > best['score']:
+                        best = {'cid': cid, 'pos': position, 'score': score, 'zone_bonus': zone_bonus}
+        
+        if best['score'] != -np.inf:
+            container = self.containers[best['cid']]
+            if self.scoring == 'balance' and mass > 0:
+                # The container is chosen as usual; balance decides where in it the item goes
+                best['pos'], best['score'] = self._best_balanced_position(
+                    best['cid'], container['space'], best['pos'][3:], item['priority'], best['zone_bonus'], mass)
+            if container['space'].add_item(item['itemId'], best['pos'], mass):
+                self._update_free_space(container, best['pos'])
+                return {'item': item, 'container': best['cid'], 'position': best['pos'],
+                        'coordinates': container['space'].to_units(best['pos']), 'score': best['score']}
+        plan = None
+        if self._rearrangement_left > 0 and self.rearrangement_time_budget > 0:
+            started = time.perf_counter()
+            plan = self.suggest_rearrangements(
+                item, time_budget=min(self.rearrangement_time_budget, self._rearrangement_left))
+            self._rearrangement_left -= time.perf_counter() - started
+        return {
+            'item': item,
+            'rearrangements': plan['moves'] if plan else [],
+            'targetContainer': plan['containerId'] if plan else None,
+            'targetPosition': plan['position'] if plan else None
+        }
+
+    def _pack_blocks(self, sorted_items):
+        """Place runs of identical items as layered blocks, other items one by one"""
+        i = 0
+        while i < len(sorted_items):
+            item = sorted_items[i]
+            signature = self._shape_signature(item)
+            j = i + 1
+            while j < len(sorted_items) and self._shape_signature(sorted_items[j]) == signature:
+                j += 1
+            group = sorted_items[i:j]
+            i = j
+            if len(group) == 1:
+                yield self._pack_one(item)
+                continue
+
+            # Preferred zone first, front-most containers win ties
+            ordered = sorted(
+                self.containers.items(),
+                key=lambda c: c[1]['metadata']['zone'] != item['preferredZone']
+            )
+            remaining = group
+            for cid, container in ordered:
+                while remaining:
+                    placed = self._place_block(cid, container, remaining)
+                    if not placed:
+                        break
+                    yield from placed
+                    remaining = remaining[len(placed):]
+                if not remaining:
+                    break
+            for leftover in remaining:
+                yield self._pack_one(leftover)
+
+    @staticmethod
+    def _shape_signature(item):
+        return (item['width'], item['depth'], item['height'], item['priority'], item['preferredZone'])
+
+    def _place_block(self, cid, container, group):
+        """Fill the largest grid of group items that fits in one free box of the container"""
+        space = container['space']
+        W, D, H = space.dims
+        mass = group[0].get('mass', 0)
+        if mass > 0 and space.max_mass is not None:
+            group = group[:max(0, int(space.remaining_mass // mass))]
+        if not group:
+            return []
+        orientations = self._orientations(space, group[0])
+        if not space.can_hold(np.prod(orientations[0]), mass):
+            return []
+        for w, d, h in orientations:
+            if not space.may_fit(w, d, h):
+                continue
+            # Fill the front face (width, then height) before going deeper
+            nx = min(len(group), W // w)
+            nz = min(-(-len(group) // nx), H // h)
+            ny = min(-(-len(group) // (nx * nz)), D // d)
+            while True:
+                free = space.free_positions(nx * w, ny * d, nz * h)
+                if len(free):
+                    break
+                if ny > 1:
+                    ny -= 1
+                elif nz > 1:
+                    nz -= 1
+                elif nx > 1:
+                    nx = nx // 2
+                else:
+                    break
+            if not len(free):
+                continue
+
+            bx, by, bz = (int(v) for v in free[0])
+            zone_bonus = 2 if container['metadata']['zone'] == group[0]['preferredZone'] else -2
+            placed = []
+            for iy in range(ny):
+                for iz in range(nz):
+                    for ix in range(nx):
+                        if len(placed) == len(group):
+                            break
+                        item = group[len(placed)]
+                        position = (bx + ix * w, by + iy * d, bz + iz * h, w, d, h)
+                        space.add_item(item['itemId'], position, mass)
+                        placed.append({'item': item, 'container': cid, 'position': position,
+                                       'coordinates': space.to_units(position),
+                                       'score': self._calculate_score(position, item['priority'], zone_bonus)})
+            # One pass over the free-space cache for the whole block
+            container['free_space'] = [
+                (y, x, z) for y, x, z in container['free_space'] if not space.occupancy[x, y, z]
+            ]
+            return placed
+        return []
 
     def find_optimal_position(self, container, dimensions):
         """Find optimal position using spatial hashing and depth-first search"""
         w, d, h = dimensions
         space = container['space']
+        key = (container['metadata']['containerId'], w, d, h)
+        cached = self._shape_cache.get(key)
+        if cached is not None and cached['removals'] != space.removals:
+            cached = None
+        if cached is not None and cached['hint'] is None:
+            return None  # already known not to fit
+
+        free_space = container['free_space']
+        start = bisect_left(free_space, cached['hint']) if cached else 0
         
         # Check cached free spaces first
-        for y, x, z in container['free_space']:
+        end = len(free_space)
+        if self.scoring == 'balance' and space.occupancy.size <= TABLE_MAX_CELLS:
+            # Balanced placement leaves holes up front, so scans run long: probe, then chunk
+            end = min(end, start + SCAN_PROBE)
+        for i in range(start, end):
+            y, x, z = free_space[i]
             if (x + w <= space.dims[0] and 
                 y + d <= space.dims[1] and 
                 z + h <= space.dims[2]):
-                if not np.any(space.occupancy[x:x+w, y:y+d, z:z+h]):
+                if not space._check_collision(x, y, z, w, d, h):
+                    self._shape_cache[key] = {'hint': (y, x, z), 'removals': space.removals}
                     return (x, y, z, w, d, h)
+
+        for i in range(end, len(free_space), SCAN_CHUNK):
+            part = free_space[i:i + SCAN_CHUNK]
+            chunk = np.fromiter(chain.from_iterable(part), dtype=np.int64, count=3 * len(part)).reshape(-1, 3)
+            table = self._summed_table(key[0], space)
+            hits = np.flatnonzero(space.fits_at(chunk[:, [1, 0, 2]], w, d, h, table))
+            if len(hits):
+                y, x, z = free_space[i + int(hits[0])]
+                self._shape_cache[key] = {'hint': (y, x, z), 'removals': space.removals}
+                return (x, y, z, w, d, h)
+        self._shape_cache[key] = {'hint': None, 'removals': space.removals}
         return None
 
+    def _summed_table(self, cid, space):
+        """Summed table for a container, reused until its occupancy changes
+
+        At most TABLE_CACHE_CELLS cells of tables are kept; the least recently used go first.
+        """
+        entry = self._tables.pop(cid, None)
+        if entry is None or entry[0] != space.version:
+            entry = (space.version, space.summed_table())
+        self._tables[cid] = entry
+        cells = sum(table.size for _, table in self._tables.values())
+        while cells > TABLE_CACHE_CELLS and len(self._tables) > 1:
+            _, (_, table) = self._tables.popitem(last=False)
+            cells -= table.size
+        return entry[1]
+
     def _calculate_score(self, position, priority, zone_bonus):
         """Calculate placement score considering priority and accessibility"""
         depth_penalty = position[1] * 0.5  # Linear depth penalty
         return (priority * 10) + zone_bonus - depth_penalty
 
-    def suggest_rearrangements(self, item):
-        """Suggest items to rearrange to make space"""
-        candidates = []
-        for cid, container in self.containers.items():
-            container_items = sorted(
-                container['space'].items.items(),
-                key=lambda x: (x[1][1], -x[1][3]*x[1][4]*x[1][5])  # Depth and volume
+    def _best_balanced_position(self, cid, space, orientation, priority, zone_bonus, mass):
+        """Best (position, score) among the front-most free origins, scored in one batch
+
+        The usual depth score is combined with how far the container's centre of mass
+        would drift from its geometric centre with the item at each candidate.
+        """
+        free = space.free_positions(*orientation, table=self._summed_table(cid, space))[:self.balance_candidates]
+        if not len(free):
+            return None, None
+        w, d, h = orientation
+        centers = free + np.array((w / 2, d / 2, h / 2))
+        scores = (self._calculate_score(free.T, priority, zone_bonus)
+                  - self.balance_weight * space.imbalance(mass, centers))
+        best = int(np.argmax(scores))
+        x, y, z = (int(v) for v in free[best])
+        return (x, y, z, int(w), int(d), int(h)), float(scores[best])
+
+    def suggest_rearrangements(self, item, time_budget=None, max_moves=None):
+        """Find the cheapest set of moves that makes room for item
+
+        Tries every combination of 1..max_moves stored items per container, cheapest to
+        move first, and accepts a plan only if the incoming item then fits and every
+        moved item gets a valid new position. Plans are ranked by number of moves, then
+        by retrieval cost. Returns the best plan found within the time budget, or None.
+        """
+        time_budget = self.rearrangement_time_budget if time_budget is None else time_budget
+        max_moves = self.max_rearrangement_moves if max_moves is None else max_moves
+        deadline = time.perf_counter() + time_budget
+        best = None
+
+        # Containers in the preferred zone are tried first
+        ordered = sorted(
+            self.containers.items(),
+            key=lambda c: c[1]['metadata']['zone'] != item['preferredZone']
+        )
+        for k in range(1, max_moves + 1):
+            for cid, container in ordered:
+                if best is not None and best['cost'][0] <= k:
+                    return best
+                for combo in combinations(self._movable_items(container), k):
+                    if time.perf_counter() > deadline:
+                        return best
+                    plan = self._try_rearrangement(item, cid, combo, deadline)
+                    if plan and (best is None or plan['cost'] < best['cost']):
+                        best = plan
+            if best is not None:
+                return best
+        return best
+
+    def _movable_items(self, container, limit=12):
+        """Stored items ranked by how cheap they are to take out (fewest blockers, front first)"""
+        space = container['space']
+        ranked = []
+        for item_id, (x, y, z, w, d, h) in space.items.items():
+            blockers = sum(
+                1 for other, (ox, oy, oz, ow, od, oh) in space.items.items()
+                if other != item_id and oy < y
+                and ox < x + w and ox + ow > x and oz < z + h and oz + oh > z
             )
-            # Propose removing last 2 items in deepest positions
-            candidates.extend(container_items[-2:])
-        
-        return [{
-            'itemId': item_id,
-            'fromContainer': cid,
-            'newPosition': None
-        } for item_id, _ in candidates]
+            ranked.append((blockers, y, -(w * d * h), item_id))
+        ranked.sort()
+        return [(item_id, blockers) for blockers, _, _, item_id in ranked[:limit]]
+
+    def _try_rearrangement(self, item, cid, combo, deadline=None):
+        """Evaluate one candidate set of moves; the spaces are always restored afterwards
+
+        Gives up (returns None) once the deadline passes, even part way through.
+        """
+        space = self.containers[cid]['space']
+        removed = [
+            (item_id, blockers, space.masses.get(item_id, 0), space.remove_item(item_id))
+            for item_id, blockers in combo
+        ]
+        placed = []  # (space, item_id) reservations to undo
+        try:
+            mass = item.get('mass', 0)
+            if mass > space.remaining_mass:
+                return None
+            target = self._first_fit(space, self._orientations(space, item), deadline)
+            if target is None:
+                return None
+            space.add_item(item['itemId'], target, mass)
+            placed.append((space, item['itemId']))
+
+            moves = []
+            # Re-home the biggest items first, they are the hardest to fit
+            for item_id, blockers, moved_mass, old in sorted(removed, key=lambda r: -(r[3][3] * r[3][4] * r[3][5])):
+                new_cid, new_pos = self._relocate(old, cid, moved_mass, deadline)
+                if new_pos is None:
+                    return None
+                self.containers[new_cid]['space'].add_item(item_id, new_pos, moved_mass)
+                placed.append((self.containers[new_cid]['space'], item_id))
+                if (new_cid, new_pos) == (cid, old):
+                    continue  # it can stay where it is, so it isn't a move
+                moves.append({
+                    'itemId': item_id,
+                    'fromContainer': cid,
+                    'fromPosition': old,
+                    'toContainer': new_cid,
+                    'newPosition': new_pos,
+                    'retrievalCost': blockers + 1
+                })
+            return {
+                'itemId': item['itemId'],
+                'containerId': cid,
+                'position': target,
+                'moves': moves,
+                'cost': (len(moves), sum(m['retrievalCost'] for m in moves))
+            }
+        finally:
+            for reserved_space, item_id in reversed(placed):
+                reserved_space.remove_item(item_id)
+            for item_id, _, moved_mass, old in removed:
+                space.add_item(item_id, old, moved_mass)
+
+    def _relocate(self, position, home_cid, mass=0, deadline=None):
+        """New (containerId, position) for a moved item, preferring its own container"""
+        lengths = self.containers[home_cid]['space'].to_units(position)[3:]
+        ordered = [home_cid] + [cid for cid in self.containers if cid != home_cid]
+        for cid in ordered:
+            if deadline is not None and time.perf_counter() > deadline:
+                return None, None
+            space = self.containers[cid]['space']
+            width, depth, height = (space.voxels(v) for v in lengths)
+            if not space.can_hold(width * depth * height, mass):
+                continue
+            # Moved items follow the same orientation policy as incoming ones
+            orientations = self.get_orientations({'width': width, 'depth': depth, 'height': height})
+            pos = self._first_fit(space, orientations, deadline)
+            if pos is not None:
+                return cid, pos
+        return None, None
+
+    @staticmethod
+    def _first_fit(space, orientations, deadline=None):
+        """Front-most free position over the given orientations (None once past the deadline)"""
+        best = None
+        for w, d, h in orientations:
+            if deadline is not None and time.perf_counter() > deadline:
+                return None
+            if not space.may_fit(w, d, h):
+                continue
+            free = space.free_positions(w, d, h)
+            if len(free):
+                x, y, z = (int(v) for v in free[0])
+                if best is None or (y, x, z) < (best[1], best[0], best[2]):
+                    best = (x, y, z, int(w), int(d), int(h))
+        return best
+
+    def _orientations(self, space, item):
+        """Orientations of item measured in the cells of space"""
+        return self.get_orientations({
+            'width': space.voxels(item['width']),
+            'depth': space.voxels(item['depth']),
+            'height': space.voxels(item['height'])
+        })
 
     @staticmethod
     def get_orientations(item):
@@ -130,10 +713,10 @@ class PriorityBinPacker:
     def _update_free_space(self, container, position):
         """Update free space cache after placement"""
         x, y, z, w, d, h = position
-        # Remove occupied positions from free space
-        container['free_space'] = deque(
+        # Remove occupied positions from free space (entries are (y, x, z))
+        container['free_space'] = [
             pos for pos in container['free_space']
-            if not (x <= pos[0] < x + w and
-                    y <= pos[1] < y + d and
+            if not (y <= pos[0] < y + d and
+                    x <= pos[1] < x + w and
                     z <= pos[2] < z + h)
-        )
\ No newline at end of file
+        ]
\ No newline at end of file
@@ -0,0 +1,101 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from .bin_packing import PriorityBinPacker
+
+
+def _sort_key(item):
+    """PriorityBinPacker.pack_items ordering with itemId breaking ties, so merges are stable"""
+    return (-item['priority'], item['width'] * item['depth'] * item['height'],
+            item['width'], item['depth'], item['preferredZone'], item['itemId'])
+
+
+def pack_zone(containers, spaces, items, options, block_building=False):
+    """Pack items into one zone's containers (runs in a worker process)
+
+    No rearrangements are attempted here: items that do not fit are handed back so
+    they can spill to other zones first. Returns (placements, unplaced, spaces).
+    """
+    packer = PriorityBinPacker(containers, **{**options, 'rearrangement_time_budget': 0})
+    packer.load_spaces(spaces)
+    placements, unplaced = [], []
+    for result in packer.pack_items(items, block_building=block_building):
+        if 'container' in result:
+            placements.append(result)
+        else:
+            unplaced.append(result['item'])
+    return placements, unplaced, {cid: c['space'] for cid, c in packer.containers.items()}
+
+
+class ZonePartitionedPacker:
+    """Packs each zone's containers in its own worker process
+
+    Items go to their preferred zone first. Items that zone cannot take, or whose zone
+    has no containers, spill to the whole station in one final serial pass, which is
+    also where rearrangements are suggested. Results come back in pack_items order
+    regardless of which worker finished first.
+
+    Any concurrent.futures executor can be passed in, so zones can be farmed out to
+    other machines with an executor that runs pack_zone remotely.
+    """
+
+    def __init__(self, containers, max_workers=None, executor=None, **packer_options):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.executor = executor
+        self.packer_options = packer_options
+        self._station = PriorityBinPacker(containers, **packer_options)
+        self.containers = self._station.containers
+        self.zones = {}
+        for c in containers:
+            self.zones.setdefault(c['zone'], []).append(c)
+
+    def load_spaces(self, spaces):
+        self._station.load_spaces(spaces)
+
+    def container_summaries(self):
+        return self._station.container_summaries()
+
+    def _spaces(self, zone):
+        return {c['containerId']: self.containers[c['containerId']]['space'] for c in self.zones[zone]}
+
+    def _run_zones(self, jobs, block_building):
+        """Run pack_zone for every zone, in parallel when there is more than one"""
+        options = self.packer_options
+        if len(jobs) <= 1 or self.max_workers <= 1:
+            return {zone: pack_zone(self.zones[zone], self._spaces(zone), items, options, block_building)
+                    for zone, items in jobs.items()}
+        executor = self.executor or ProcessPoolExecutor(max_workers=min(self.max_workers, len(jobs)))
+        try:
+            futures = {
+                zone: executor.submit(pack_zone, self.zones[zone], self._spaces(zone), items, options,
+                                      block_building)
+                for zone, items in jobs.items()
+            }
+            return {zone: future.result() for zone, future in futures.items()}
+        finally:
+            if executor is not self.executor:
+                executor.shutdown()
+
+    def pack_items(self, items, block_building=False):
+        """Pack items zone by zone, then spill the leftovers; returns results in priority order"""
+        jobs, spill = {}, []
+        for item in sorted(items, key=_sort_key):
+            if item['preferredZone'] in self.zones:
+                jobs.setdefault(item['preferredZone'], []).append(item)
+            else:
+                spill.append(item)
+
+        results = []
+        # Merge in zone order so ties never depend on worker timing
+        for zone, (placements, unplaced, spaces) in sorted(self._run_zones(jobs, block_building).items()):
+            self._station.load_spaces(spaces)
+            results.extend(placements)
+            spill.extend(unplaced)
+
+        if spill:
+            print(f"📦 {len(spill)} items spilled out of their preferred zone")
+            results.extend(self._station.pack_items(spill, block_building=block_building))
+
+        order = {item['itemId']: i for i, item in enumerate(sorted(items, key=_sort_key))}
+        results.sort(key=lambda r: order[r['item']['itemId']])
+        return results
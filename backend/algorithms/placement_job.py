@@ -0,0 +1,98 @@
+import os
+import time
+
+from .bin_packing import PriorityBinPacker
+from .partitioned import ZonePartitionedPacker
+from .snapshots import restore_spaces
+
+PROGRESS_INTERVAL = 0.25  # seconds between progress reports
+# Default for the 'workers' option: 0 packs serially, N > 0 packs zones in N processes
+PLACEMENT_WORKERS = int(os.environ.get("CARGO_PLACEMENT_WORKERS", "0"))
+
+
+def position_document(coordinates):
+    """Stored position document for a (x, y, z, w, d, h) position in container units"""
+    x, y, z, w, d, h = (float(v) for v in coordinates)
+    return {
+        'startCoordinates': {'width': x, 'depth': y, 'height': z},
+        'endCoordinates': {'width': x + w, 'depth': y + d, 'height': z + h}
+    }
+
+
+def _units(packer, container_id, position):
+    """Position document for a grid-cell position in a packer container, like placements get"""
+    if position is None:
+        return None
+    return position_document(packer.containers[container_id]['space'].to_units(position))
+
+
+def run_placement_job(containers, items, stored_items=(), options=None, snapshot_dir=None, db_version=None,
+                      progress=None, cancel=None):
+    """Pack pending items around what is already stored, reporting progress as it goes
+
+    Runs in a job worker. progress is any object with put_nowait (a queue), cancel any
+    object with is_set (an event); both are optional. Occupancy is mapped in from the
+    snapshot in snapshot_dir when there is one, replaying only the stored items that
+    changed unless its version matches db_version. Returns the placements and the
+    rearrangement suggestions for items that did not fit; nothing is written to the
+    database here.
+
+    With options['workers'] > 0 each zone is packed in its own process (see
+    ZonePartitionedPacker); progress then jumps once the zones are merged.
+    """
+    options = dict(options or {})
+    block_building = options.pop('block_building', False)
+    workers = options.pop('workers', 0)
+    state = {'status': 'running', 'processed': 0, 'placed': 0, 'unplaced': 0,
+             'total': len(items), 'bestScore': None}
+
+    def report(force=False):
+        now = time.perf_counter()
+        if progress is not None and (force or now - state.get('_reported', 0) >= PROGRESS_INTERVAL):
+            state['_reported'] = now
+            progress.put_nowait({k: v for k, v in state.items() if not k.startswith('_')})
+
+    report(force=True)
+    if workers:
+        packer = ZonePartitionedPacker(containers, max_workers=workers, **options)
+    else:
+        packer = PriorityBinPacker(containers, **options)
+    spaces, restored = restore_spaces(containers, stored_items, directory=snapshot_dir, db_version=db_version)
+    packer.load_spaces(spaces)
+
+    placements, unplaced = [], []
+    for result in packer.pack_items(items, block_building=block_building):
+        if cancel is not None and cancel.is_set():
+            state['status'] = 'cancelled'
+            report(force=True)
+            return {'status': 'cancelled', 'placements': [], 'unplaced': [], 'snapshot': restored}
+        state['processed'] += 1
+        item_id = result['item']['itemId']
+        if 'container' in result:
+            placements.append({
+                'itemId': item_id,
+                'containerId': result['container'],
+                'position': position_document(result['coordinates']),
+                'score': result['score']
+            })
+            state['placed'] += 1
+            if state['bestScore'] is None or result['score'] > state['bestScore']:
+                state['bestScore'] = result['score']
+        else:
+            unplaced.append({
+                'itemId': item_id,
+                'targetContainer': result['targetContainer'],
+                'targetPosition': _units(packer, result['targetContainer'], result['targetPosition']),
+                'rearrangements': [
+                    {**move,
+                     'fromPosition': _units(packer, move['fromContainer'], move['fromPosition']),
+                     'newPosition': _units(packer, move['toContainer'], move['newPosition'])}
+                    for move in result['rearrangements']
+                ]
+            })
+            state['unplaced'] += 1
+        report()
+
+    state['status'] = 'finished'
+    report(force=True)
+    return {'status': 'completed', 'placements': placements, 'unplaced': unplaced, 'snapshot': restored}
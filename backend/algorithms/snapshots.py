@@ -0,0 +1,213 @@
+import hashlib
+import json
+import os
+import uuid
+import zlib
+from datetime import datetime
+
+import numpy as np
+
+from .bin_packing import ContainerSpace
+
+SNAPSHOT_FORMAT = 1
+INDEX_FILE = "index.json"
+# Where the API keeps the snapshot placement jobs start from; empty disables snapshots
+SNAPSHOT_DIR = os.environ.get("CARGO_SNAPSHOT_DIR", "snapshots")
+
+
+def position_from_document(item):
+    """Return (x, y, z, w, d, h) in container units for a stored item document, or None if it has no position"""
+    position = item.get('position')
+    if not position:
+        return None
+    if isinstance(position, (list, tuple)):
+        return tuple(position)
+    start = position.get('startCoordinates', {})
+    end = position.get('endCoordinates', {})
+    x, y, z = start.get('width', 0), start.get('depth', 0), start.get('height', 0)
+    return (x, y, z,
+            end.get('width', 0) - x,
+            end.get('depth', 0) - y,
+            end.get('height', 0) - z)
+
+
+def _spaces(containers):
+    """Accept {cid: ContainerSpace} or the PriorityBinPacker container layout"""
+    return {
+        cid: c['space'] if isinstance(c, dict) else c
+        for cid, c in containers.items()
+    }
+
+
+def _index_checksum(dims, items):
+    payload = json.dumps([list(dims), sorted((k, list(v)) for k, v in items.items())])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def save_snapshot(containers, directory, db_version=None):
+    """Persist occupancy grids as .npy files plus a JSON index of item positions
+
+    Every save writes its grids under new file names and swaps the index in last with
+    one rename, so a crash mid-save leaves the previous index and its grids intact.
+    Grids the new index no longer lists are deleted afterwards.
+    """
+    os.makedirs(directory, exist_ok=True)
+    generation = uuid.uuid4().hex[:12]
+    index = {
+        'format': SNAPSHOT_FORMAT,
+        'generation': generation,
+        'dbVersion': db_version,
+        'createdAt': datetime.utcnow().isoformat(),
+        'containers': {}
+    }
+    for cid, space in _spaces(containers).items():
+        filename = f"{hashlib.sha1(cid.encode()).hexdigest()[:16]}-{generation}.npy"
+        with open(os.path.join(directory, filename), 'wb') as f:
+            np.save(f, np.ascontiguousarray(space.occupancy, dtype=bool))
+        index['containers'][cid] = {
+            'file': filename,
+            'dims': list(space.dims),
+            'gridCrc': zlib.crc32(np.ascontiguousarray(space.occupancy).tobytes()),
+            'checksum': _index_checksum(space.dims, space.items),
+            'items': {item_id: list(pos) for item_id, pos in space.items.items()},
+            'masses': space.masses,
+            'maxMass': space.max_mass,
+            'resolution': space.resolution
+        }
+
+    tmp_index = os.path.join(directory, f"{INDEX_FILE}.{generation}.tmp")
+    with open(tmp_index, 'w') as f:
+        json.dump(index, f)
+    os.replace(tmp_index, os.path.join(directory, INDEX_FILE))
+    _remove_unlisted_grids(directory, index)
+    print(f"💾 Saved occupancy snapshot of {len(index['containers'])} containers (db version {db_version})")
+    return index
+
+
+def _remove_unlisted_grids(directory, index):
+    """Delete grids of earlier saves (and any a crashed save left behind)
+
+    Grids already mapped stay readable after their file is unlinked; a load that reads
+    the old index and then misses its grid treats the snapshot as missing.
+    """
+    listed = {entry['file'] for entry in index['containers'].values()}
+    for name in os.listdir(directory):
+        if name.endswith('.npy') and name not in listed:
+            try:
+                os.remove(os.path.join(directory, name))
+            except FileNotFoundError:
+                pass
+
+
+def load_snapshot(directory, verify=False):
+    """Map a snapshot back in without copying the grids
+
+    Grids are opened copy-on-write, so placements made after loading never touch the
+    files on disk. Returns (spaces, index) or (None, None) if the snapshot is missing
+    or fails its checksums.
+    """
+    index_path = os.path.join(directory, INDEX_FILE)
+    if not os.path.exists(index_path):
+        return None, None
+    with open(index_path) as f:
+        index = json.load(f)
+    if index.get('format') != SNAPSHOT_FORMAT:
+        print(f"⚠️ Ignoring snapshot with unsupported format {index.get('format')}")
+        return None, None
+
+    spaces = {}
+    for cid, entry in index['containers'].items():
+        items = {item_id: tuple(pos) for item_id, pos in entry['items'].items()}
+        if _index_checksum(entry['dims'], items) != entry['checksum']:
+            print(f"⚠️ Snapshot index for {cid} failed its checksum")
+            return None, None
+        try:
+            grid = np.load(os.path.join(directory, entry['file']), mmap_mode='c')
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Snapshot grid for {cid} could not be read: {str(e)}")
+            return None, None
+        if list(grid.shape) != entry['dims']:
+            print(f"⚠️ Snapshot grid for {cid} has the wrong shape")
+            return None, None
+        # Verifying the grid reads every page, so it is opt-in
+        if verify and zlib.crc32(np.ascontiguousarray(grid).tobytes()) != entry['gridCrc']:
+            print(f"⚠️ Snapshot grid for {cid} failed its checksum")
+            return None, None
+        spaces[cid] = ContainerSpace.from_grid(
+            grid, items, masses=entry.get('masses'), max_mass=entry.get('maxMass'),
+            resolution=entry.get('resolution', 1.0))
+    return spaces, index
+
+
+def replay_delta(spaces, stored_items):
+    """Bring snapshot spaces up to date with the stored item documents
+
+    Only items that were added, removed or moved since the snapshot touch the grids.
+    Items whose cells are already taken are left out and counted as failed.
+    """
+    current = {}
+    for item in stored_items:
+        position = position_from_document(item)
+        cid = item.get('containerId')
+        if position is not None and cid in spaces:
+            current[item['itemId']] = (cid, spaces[cid].from_units(position), item.get('mass', 0))
+
+    stats = {'added': 0, 'removed': 0, 'moved': 0, 'failed': 0}
+    moved = set()
+    for cid, space in spaces.items():
+        for item_id, position in list(space.items.items()):
+            if current.get(item_id, (None, None))[:2] != (cid, position):
+                space.remove_item(item_id)
+                if item_id in current:
+                    moved.add(item_id)
+                else:
+                    stats['removed'] += 1
+
+    for item_id, (cid, position, mass) in current.items():
+        space = spaces[cid]
+        if item_id not in space.items:
+            if not space.add_item(item_id, position, mass):
+                stats['failed'] += 1
+            elif item_id in moved:
+                stats['moved'] += 1
+            else:
+                stats['added'] += 1
+    return stats
+
+
+def restore_spaces(containers, stored_items, directory=None, db_version=None):
+    """Rebuild ContainerSpaces for containers, from a snapshot when a usable one exists
+
+    Returns (spaces, info) where info says whether the snapshot was used and how many
+    item changes were replayed on top of it. A snapshot whose grid disagrees with the
+    stored items (a replayed item collides with cells nothing occupies) is dropped and
+    the grids are rebuilt from scratch.
+    """
+    spaces, index = load_snapshot(directory) if directory else (None, None)
+    resolution = {c['containerId']: float(c.get('resolution', 1.0)) for c in containers}
+    dims = {
+        c['containerId']: list(ContainerSpace.grid_dims(
+            c['width'], c['depth'], c['height'], resolution[c['containerId']]))
+        for c in containers
+    }
+
+    if spaces is not None and all(
+            cid in spaces and list(spaces[cid].dims) == d
+            and spaces[cid].resolution == resolution[cid] for cid, d in dims.items()):
+        spaces = {cid: spaces[cid] for cid in dims}
+        if db_version is not None and index.get('dbVersion') == db_version:
+            return spaces, {'snapshot': True, 'replayed': None, 'dbVersion': db_version}
+        stats = replay_delta(spaces, stored_items)
+        if not stats['failed']:
+            return spaces, {'snapshot': True, 'replayed': stats, 'dbVersion': db_version}
+        print(f"⚠️ {stats['failed']} items did not fit the snapshot grids, rebuilding them")
+
+    spaces = {
+        c['containerId']: ContainerSpace(c['width'], c['depth'], c['height'], max_mass=c.get('maxWeight'),
+                                         resolution=resolution[c['containerId']])
+        for c in containers
+    }
+    stats = replay_delta(spaces, stored_items)
+    if stats['failed']:
+        print(f"⚠️ {stats['failed']} stored items overlap other items and were left out of the grids")
+    return spaces, {'snapshot': False, 'replayed': stats, 'dbVersion': db_version}
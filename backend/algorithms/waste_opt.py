@@ -0,0 +1,38 @@
+class WasteOptimizer:
+    """Waste management with 3D bin packing"""
+    
+    def __init__(self, containers):
+        self.containers = containers
+        
+    def generate_return_plan(self, waste_items, max_weight):
+        """3D bin packing with weight and volume constraints"""
+        sorted_items = sorted(waste_items, 
+                            key=lambda x: (-x['mass'], x['volume']))
+        
+        bins = []
+        for item in sorted_items:
+            placed = False
+            for bin in bins:
+                # Check weight and volume constraints
+                if (bin['mass'] + item['mass'] <= max_weight and
+                    bin['volume'] + item['volume'] <= bin['max_volume']):
+                    
+                    bin['items'].append(item)
+                    bin['mass'] += item['mass']
+                    bin['volume'] += item['volume']
+                    placed = True
+                    break
+                    
+            if not placed:
+                bins.append({
+                    'items': [item],
+                    'mass': item['mass'],
+                    'volume': item['volume'],
+                    'max_volume': self._get_container_volume(item['target_container'])
+                })
+                
+        return bins
+
+    def _get_container_volume(self, container_id):
+        container = next(c for c in self.containers if c['containerId'] == container_id)
+        return container['width'] * container['depth'] * container['height']
\ No newline at end of file
@@ -1,29 +1,72 @@
-from fastapi import FastAPI, HTTPException, Query, UploadFile, File
+import time
+BOOT_STARTED = time.perf_counter()  # cold start is measured from here, imports included
+
+from fastapi import FastAPI, HTTPException, Query, Request, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, PlainTextResponse, Response, StreamingResponse
 from pydantic import BaseModel
+from pymongo import UpdateOne
 from typing import List, Optional
 from datetime import datetime, timedelta
+import asyncio
+import base64
 import csv
+import hashlib
 import io
-from database import (
+import json
+import threading
+from db.mongodb import (
     db, 
     items_collection, 
     logs_collection, 
     containers_collection,
     log_action,
-    mark_item_as_waste,
-    get_waste_items
+    use_item,
+    mark_waste,
+    normalize_expiry,
+    get_waste_version,
+    ACTIVE_STATUSES,
+    get_waste_items,
+    list_items_page,
+    bump_occupancy_version,
+    get_occupancy_version,
+    init_database,
+    database_status
 )
-from placement import SpatialPlacement
-from retrieve import RetrievalSystem
+from utils.events import change_feed, format_sse, parse_cursor
+from utils.jobs import JobManager
+from utils.plan_cache import PlanCache, plan_key
+from utils.responses import COMPRESS_MIN_BYTES, FastJSONResponse, dumps
+from utils.profiling import RequestProfiler, requested_profile_mode, is_admin, load_profile, run_profiled
 import uuid
 
-app = FastAPI(title="ISS Cargo Management System")
+app = FastAPI(title="ISS Cargo Management System", default_response_class=FastJSONResponse)
+
+# The algorithms pull in NumPy, so endpoints import them on first use
+_startup_tasks = set()
+
+# Placement runs as background jobs so long optimizations never hold a request open
+job_manager = JobManager(feed=change_feed)
+# Identical manifests against unchanged occupancy reuse the earlier plan
+plan_cache = PlanCache()
+# Plans are committed from worker threads, one at a time
+_commit_lock = threading.Lock()
+# Occupancy grids as of the last snapshot this process saved
+_occupancy = {"spaces": None}
+
 
-# Initialize core systems
-placement_system = SpatialPlacement()
-retrieval_system = RetrievalSystem()
+@app.on_event("startup")
+async def start_database():
+    """Connect to the database in the background so the server can boot immediately"""
+    print(f"🚀 API imported in {time.perf_counter() - BOOT_STARTED:.2f}s, connecting to database...")
+    task = asyncio.create_task(init_database())
+    _startup_tasks.add(task)
+    task.add_done_callback(_startup_tasks.discard)
+
+@app.on_event("shutdown")
+async def stop_jobs():
+    job_manager.shutdown()
 
 # Enable CORS
 app.add_middleware(
@@ -32,8 +75,40 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Change-Cursor"],
 )
 
+# Large item lists compress well; clients opt in with Accept-Encoding (SSE is never buffered)
+if COMPRESS_MIN_BYTES > 0:
+    app.add_middleware(GZipMiddleware, minimum_size=COMPRESS_MIN_BYTES)
+
+# Opt-in profiling: send "X-Profile: cprofile|sampling|memory" (or ?profile=...)
+# together with "X-Admin-Token" to profile a single request
+@app.middleware("http")
+async def profile_request(request: Request, call_next):
+    mode = requested_profile_mode(request.headers, request.query_params)
+    if not mode:
+        return await call_next(request)
+    if not is_admin(request.headers):
+        return FastJSONResponse(
+            status_code=403,
+            content={"success": False, "message": "Profiling requires a valid admin token"}
+        )
+
+    try:
+        profiler = RequestProfiler(mode, label=f"{request.method} {request.url.path}")
+    except ValueError as e:
+        return FastJSONResponse(status_code=400, content={"success": False, "message": str(e)})
+
+    try:
+        profiler.start()
+        response = await call_next(request)
+    finally:
+        profiler.stop(containers=_live_spaces)
+    response.headers["X-Profile-Id"] = profiler.profile_id
+    response.headers["Server-Timing"] = f"profile;dur={profiler.elapsed * 1000:.1f}"
+    return response
+
 ### ✅ Data Models
 class ItemRequest(BaseModel):
     itemId: str
@@ -63,49 +138,256 @@ class SimulationRequest(BaseModel):
     numDays: int
     itemsUsedPerDay: List[str]
 
+### ✅ Field projections, so each endpoint only reads what it returns
+PLACEMENT_FIELDS = {"_id": 0, "itemId": 1, "width": 1, "depth": 1, "height": 1, "mass": 1,
+                    "priority": 1, "preferredZone": 1}
+SEARCH_FIELDS = {"_id": 0, "itemId": 1, "name": 1, "containerId": 1, "position": 1, "priority": 1,
+                 "expiryDate": 1, "expiryAt": 1, "usageLimit": 1, "preferredZone": 1, "status": 1}
+WASTE_FIELDS = {"_id": 0, "itemId": 1, "name": 1, "wasteReason": 1, "containerId": 1, "position": 1,
+                "mass": 1, "expiryDate": 1, "usageLimit": 1, "wasteVersion": 1}
+EXPORT_FIELDS = {"_id": 0, "itemId": 1, "containerId": 1, "position": 1}
+POSITION_FIELDS = {"_id": 0, "itemId": 1, "containerId": 1, "position": 1, "mass": 1}
+
 ### ✅ Core API Endpoints
-@app.post("/api/placement", response_model=dict)
-async def optimize_placement():
-    """Handle placement optimization with uploaded data"""
+async def _finish_placement(job, result):
+    """Cache a finished plan, then store it unless the job was a dry run"""
+    if job["cacheKey"]:
+        plan_cache.put(job["cacheKey"], result)
+    if job["dryRun"]:
+        return "completed"
+    return await _store_placement(job, result)
+
+async def _store_placement(job, plan):
+    """Commit a plan off the event loop, then announce the placed items"""
+    outcome = await asyncio.to_thread(_commit_placement, job, plan)
+    if outcome["status"] == "completed":
+        for placement in plan["placements"]:
+            change_feed.publish(
+                "item.placed", placement["itemId"],
+                status="stored",
+                containerId=placement["containerId"],
+                position=placement["position"]
+            )
+    return outcome
+
+def _commit_placement(job, plan):
+    """Write a placement plan in one bulk write, unless occupancy moved on meanwhile
+
+    Runs in a worker thread; the lock keeps the version check, the write and the
+    version bump together. Returns the job outcome: its status and how many items
+    were stored, or why nothing was.
+    """
+    with _commit_lock:
+        if get_occupancy_version() != job["occupancyVersion"]:
+            print("⚠️ Placement plan is stale, items were moved after it was computed")
+            return {
+                "status": "stale",
+                "error": "Items were moved after this plan was computed, so nothing was stored; "
+                         "submit the placement again",
+                "stored": 0
+            }
+
+        stored = 0
+        if plan["placements"]:
+            written = items_collection.for_operation("placement").bulk_write([
+                UpdateOne(
+                    {"itemId": placement["itemId"], "status": "pending"},
+                    {"$set": {
+                        "status": "stored",
+                        "position": placement["position"],
+                        "containerId": placement["containerId"]
+                    }}
+                )
+                for placement in plan["placements"]
+            ], ordered=False)
+            stored = written.modified_count
+            bump_occupancy_version()
+            _refresh_snapshot()
+        return {"status": "completed", "stored": stored}
+
+def _live_spaces():
+    """Occupancy grids for profiles: the snapshot this process last saved, or the one on disk"""
+    if _occupancy["spaces"] is None:
+        from algorithms.snapshots import SNAPSHOT_DIR, load_snapshot
+        if SNAPSHOT_DIR:
+            _occupancy["spaces"], _ = load_snapshot(SNAPSHOT_DIR)
+    return _occupancy["spaces"]
+
+def _snapshot_version():
+    """Database state a snapshot reflects: stored positions change with the occupancy
+    version, and stored items only leave storage by turning into waste"""
+    return [get_occupancy_version(), get_waste_version()]
+
+def _refresh_snapshot():
+    """Save the current occupancy grids, so the next placement job maps them in"""
+    from algorithms.snapshots import SNAPSHOT_DIR, restore_spaces, save_snapshot
+    if not SNAPSHOT_DIR:
+        return
+    try:
+        version = _snapshot_version()
+        containers = list(containers_collection.find({}, {"_id": 0}))
+        stored = list(items_collection.find({"status": "stored"}, POSITION_FIELDS))
+        # Starts from the previous snapshot and replays only what changed since
+        spaces, _ = restore_spaces(containers, stored, directory=SNAPSHOT_DIR)
+        if _snapshot_version() != version:
+            version = None  # changed during the reads; the snapshot is then always replayed
+        save_snapshot(spaces, SNAPSHOT_DIR, db_version=version)
+        _occupancy["spaces"] = spaces
+    except Exception as e:
+        print(f"⚠️ Could not save occupancy snapshot: {str(e)}")
+
+@app.post("/api/placement", response_model=dict, status_code=202)
+async def optimize_placement(request: Request, blockBuilding: bool = False, dryRun: bool = False,
+                             scoring: str = Query("depth", pattern="^(depth|balance)$"),
+                             workers: Optional[int] = Query(None, ge=0, le=64)):
+    """Queue a placement optimization for all pending items and return its job id
+
+    A plan already computed for the same items, containers, occupancy and settings is
+    returned (and, unless dryRun, stored) right away as a completed job. workers > 0
+    packs each zone in its own process (default: CARGO_PLACEMENT_WORKERS). A profiled
+    request also profiles the job in its worker; the job's profileId says where to find it.
+    """
     try:
         # Get all available items and containers
-        items = list(items_collection.find({"status": "pending"}, {"_id": 0}))
+        items = list(items_collection.find({"status": "pending"}, PLACEMENT_FIELDS))
         containers = list(containers_collection.find({}, {"_id": 0}))
 
         if not items:
-            return JSONResponse(
+            return FastJSONResponse(
                 status_code=400,
                 content={"success": False, "message": "No items to place"}
             )
-
-        # Run placement optimization
-        result = placement_system.find_optimal_placement(items)
-        
-        if not result["success"]:
-            return JSONResponse(
+        if not containers:
+            return FastJSONResponse(
                 status_code=400,
-                content=result
-            )
-
-        # Update database with placements
-        for placement in result["placements"]:
-            items_collection.update_one(
-                {"itemId": placement["itemId"]},
-                {"$set": {
-                    "status": "stored",
-                    "position": placement["position"],
-                    "containerId": placement["containerId"]
-                }}
+                content={"success": False, "message": "No containers available"}
             )
 
-        return JSONResponse(content=result)
+        from algorithms.placement_job import PLACEMENT_WORKERS
+        options = {"block_building": blockBuilding, "scoring": scoring,
+                   "workers": PLACEMENT_WORKERS if workers is None else workers}
+        version = get_occupancy_version()
+        # An unknown occupancy version could match a different layout, so don't cache then
+        key = plan_key(items, containers, version, options) if version is not None else None
+        meta = {"occupancyVersion": version, "dryRun": dryRun, "cacheKey": key}
+
+        plan = plan_cache.get(key) if key else None
+        if plan is not None:
+            outcome = {"status": "completed"} if dryRun else await _store_placement(meta, plan)
+            job = job_manager.record("placement", plan, cached=True, **meta, **outcome)
+            return FastJSONResponse(status_code=200, content={"success": True, "job": job})
+
+        snapshot_version = _snapshot_version()
+        stored = list(items_collection.find({"status": "stored"}, POSITION_FIELDS))
+        from algorithms.placement_job import run_placement_job
+        from algorithms.snapshots import SNAPSHOT_DIR
+        fn, args = run_placement_job, (containers, items, stored, options, SNAPSHOT_DIR or None, snapshot_version)
+        # The middleware only sees the job being queued, so the packing is profiled in the worker
+        profile = requested_profile_mode(request.headers, request.query_params)
+        if profile and is_admin(request.headers):
+            meta["profileId"] = uuid.uuid4().hex[:12]
+            fn, args = run_profiled, (profile, "placement job", meta["profileId"], fn, *args)
+        job = job_manager.submit("placement", fn, *args, on_complete=_finish_placement, cached=False, **meta)
+        return FastJSONResponse(status_code=202, content={"success": True, "job": job})
     
     except Exception as e:
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=500,
             content={"success": False, "message": f"Placement error: {str(e)}"}
         )
 
+@app.get("/api/placement/cache", response_model=dict)
+async def placement_cache_stats():
+    """Hit/miss counters and size of the placement plan cache"""
+    return FastJSONResponse(content={"success": True, "cache": plan_cache.stats()})
+
+@app.get("/api/placement/jobs/{job_id}", response_model=dict)
+async def get_placement_job(job_id: str):
+    """Poll a placement job for its status, progress and (once finished) result"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return FastJSONResponse(
+            status_code=404,
+            content={"success": False, "message": "Job not found"}
+        )
+    return FastJSONResponse(content={"success": True, "job": job})
+
+@app.delete("/api/placement/jobs/{job_id}", response_model=dict)
+async def cancel_placement_job(job_id: str):
+    """Cancel a queued or running placement job; nothing it computed is stored"""
+    job = job_manager.cancel(job_id)
+    if job is None:
+        return FastJSONResponse(
+            status_code=404,
+            content={"success": False, "message": "Job not found"}
+        )
+    return FastJSONResponse(content={"success": True, "job": job})
+
+def _encode_cursor(item_id):
+    return base64.urlsafe_b64encode(json.dumps({"after": item_id}).encode()).decode()
+
+def _decode_cursor(cursor):
+    """itemId a cursor points after; ValueError for anything _encode_cursor didn't produce"""
+    decoded = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    if not isinstance(decoded, dict) or "after" not in decoded:
+        raise ValueError("Invalid cursor")
+    return decoded["after"]
+
+@app.get("/api/items", response_model=dict)
+async def list_items(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    fields: Optional[str] = None,
+    status: Optional[str] = None,
+    zone: Optional[str] = None,
+    containerId: Optional[str] = None
+):
+    """List items a page at a time (keyset on itemId) with optional projection and filters
+
+    The X-Change-Cursor header says where to subscribe to /api/changes/stream from so
+    no change made after the first page was read is missed.
+    """
+    try:
+        try:
+            after = _decode_cursor(cursor) if cursor else None
+        except (ValueError, KeyError, TypeError):
+            return FastJSONResponse(
+                status_code=400,
+                content={"success": False, "message": "Invalid cursor"}
+            )
+
+        filters = {}
+        if status:
+            filters["status"] = status
+        if zone:
+            filters["preferredZone"] = zone
+        if containerId:
+            filters["containerId"] = containerId
+        field_list = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+
+        # Read before the page: subscribing from here replays anything the page misses
+        change_cursor = change_feed.cursor()
+        items, last_id = list_items_page(filters, after=after, limit=limit, fields=field_list)
+        body = dumps({
+            "success": True,
+            "data": items,
+            "nextCursor": _encode_cursor(last_id) if last_id is not None else None
+        })
+
+        # Clients revalidate with If-None-Match and skip the download when the page is unchanged
+        etag = f'W/"{hashlib.sha1(body).hexdigest()}"'
+        headers = {"ETag": etag, "Cache-Control": "no-cache", "X-Change-Cursor": change_cursor}
+        if etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    except Exception as e:
+        return FastJSONResponse(
+            status_code=500,
+            content={"success": False, "message": f"Listing error: {str(e)}"}
+        )
+
 @app.get("/api/search", response_model=dict)
 async def search_item(
     itemName: str = Query(..., min_length=1),
@@ -113,15 +395,16 @@ async def search_item(
 ):
     """Find optimal item to retrieve"""
     try:
-        item = retrieval_system.find_optimal_item(itemName)
-        if not item:
-            return JSONResponse(
+        search_items = items_collection.for_operation("search")
+        candidates = list(search_items.find({"name": itemName, "status": "stored"}, SEARCH_FIELDS))
+        if not candidates:
+            return FastJSONResponse(
                 status_code=404,
                 content={"success": False, "message": "Item not found"}
             )
 
-        # Get retrieval path
-        path = retrieval_system.get_retrieval_path(item["itemId"])
+        item, steps = _easiest_to_retrieve(candidates, search_items)
+        path = {"steps": steps}
         
         # Log search action
         log_action(
@@ -134,69 +417,98 @@ async def search_item(
             }
         )
 
-        return JSONResponse(content={
+        return FastJSONResponse(content={
             "success": True,
             "item": item,
             "retrievalSteps": path["steps"]
         })
     
     except Exception as e:
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=500,
             content={"success": False, "message": f"Search error: {str(e)}"}
         )
 
+def _easiest_to_retrieve(candidates, collection):
+    """Candidate with the fewest items in the way (then soonest expiry, fewest uses) and its steps"""
+    from types import SimpleNamespace
+    from algorithms import RetrievalPathFinder
+    from algorithms.snapshots import position_from_document
+
+    # Blockers only depend on positions, so no occupancy grids are built here
+    container_ids = sorted({c.get("containerId") for c in candidates if c.get("containerId")})
+    positions = {cid: {} for cid in container_ids}
+    for doc in collection.find({"containerId": {"$in": container_ids}, "status": "stored"}, POSITION_FIELDS):
+        position = position_from_document(doc)
+        if position is not None:
+            positions[doc["containerId"]][doc["itemId"]] = position
+
+    ranked = []
+    for candidate in candidates:
+        cid = candidate.get("containerId")
+        steps = RetrievalPathFinder(SimpleNamespace(items=positions[cid])).find_retrieval_path(
+            candidate["itemId"]) if cid else []
+        ranked.append((len(steps), candidate.get("expiryAt") or datetime.max,
+                       candidate.get("usageLimit", 0), candidate["itemId"], candidate, steps))
+    _, _, _, _, item, steps = min(ranked, key=lambda r: r[:4])
+    return item, steps
+
 @app.post("/api/retrieve", response_model=dict)
 async def retrieve_item(request: RetrievalRequest):
     """Execute item retrieval"""
     try:
-        # Validate item exists
-        item = items_collection.find_one({"itemId": request.itemId})
+        # One conditional round trip: decrement only a stored item with a use left
+        item = use_item(request.itemId)
         if not item:
-            return JSONResponse(
-                status_code=404,
-                content={"success": False, "message": "Item not found"}
+            # Only failed retrievals read the item again, to say why
+            current = items_collection.find_one({"itemId": request.itemId}, {"_id": 0, "status": 1})
+            if not current:
+                return FastJSONResponse(
+                    status_code=404,
+                    content={"success": False, "message": "Item not found"}
+                )
+            message = ("Item has no uses remaining" if current.get("status") == "stored"
+                       else f"Item is {current.get('status')}, not stored")
+            return FastJSONResponse(
+                status_code=409,
+                content={"success": False, "message": message}
             )
 
-        # Execute retrieval
-        success = retrieval_system.execute_retrieval(
-            item["itemId"],
-            request.userId
+        log_action(
+            action_type="retrieve",
+            item_id=request.itemId,
+            user_id=request.userId,
+            details={"remainingUses": item["usageLimit"], "status": item.get("status")}
         )
-        
-        if not success:
-            return JSONResponse(
-                status_code=400,
-                content={"success": False, "message": "Retrieval failed"}
-            )
-
-        # Update usage count
-        new_usage = item["usageLimit"] - 1
-        update_data = {
-            "usageLimit": new_usage,
-            "lastAccessed": datetime.utcnow()
-        }
-
-        if new_usage <= 0:
-            mark_item_as_waste(item["itemId"], "Usage exhausted")
-            update_data["status"] = "waste"
-
-        items_collection.update_one(
-            {"itemId": request.itemId},
-            {"$set": update_data}
+        change_feed.publish(
+            "item.retrieved", request.itemId,
+            usageLimit=item["usageLimit"],
+            status=item.get("status"),
+            userId=request.userId
         )
 
-        return JSONResponse(content={
+        return FastJSONResponse(content={
             "success": True,
-            "remainingUses": new_usage
+            "remainingUses": item["usageLimit"]
         })
     
     except Exception as e:
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=500,
             content={"success": False, "message": f"Retrieval error: {str(e)}"}
         )
 
+def _waste_where(query, reason):
+    """Mark active items matching query as waste; ids are read first so clients get per-item deltas"""
+    ids = [doc["itemId"] for doc in items_collection.find(
+        {"status": {"$in": ACTIVE_STATUSES}, **query}, {"_id": 0, "itemId": 1}
+    )]
+    if not ids:
+        return
+    version, _ = mark_waste({"itemId": {"$in": ids}}, reason)
+    for item_id in ids:
+        change_feed.publish("item.wasted", item_id, status="waste", wasteReason=reason, wasteVersion=version)
+
 @app.post("/api/simulate/day", response_model=dict)
 async def simulate_time(request: SimulationRequest):
     """Advance simulation time"""
@@ -206,16 +518,16 @@ async def simulate_time(request: SimulationRequest):
         for day in range(request.numDays):
             # Process daily usage
             for item_id in request.itemsUsedPerDay:
-                items_collection.update_one(
-                    {"itemId": item_id},
+                result = items_collection.update_one(
+                    {"itemId": item_id, "usageLimit": {"$gt": 0}},
                     {"$inc": {"usageLimit": -1}}
                 )
+                if result.matched_count:
+                    change_feed.publish("item.used", item_id, usageDelta=-1)
 
-            # Check expirations
-            items_collection.update_many(
-                {"expiryDate": {"$lt": current_date}},
-                {"$set": {"status": "waste"}}
-            )
+            # Both checks hit the (status, expiryAt) / (status, usageLimit) indexes
+            _waste_where({"expiryAt": {"$lt": current_date}}, "Expired")
+            _waste_where({"usageLimit": {"$lte": 0}}, "Usage exhausted")
 
             current_date += timedelta(days=1)
 
@@ -225,30 +537,37 @@ async def simulate_time(request: SimulationRequest):
             {"$set": {"value": current_date}},
             upsert=True
         )
+        change_feed.publish("simulation.advanced", None, newDate=current_date.isoformat(), days=request.numDays)
 
-        return JSONResponse(content={
+        return FastJSONResponse(content={
             "success": True,
             "newDate": current_date.isoformat()
         })
     
     except Exception as e:
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=500,
             content={"success": False, "message": f"Simulation error: {str(e)}"}
         )
 
 @app.get("/api/waste/identify", response_model=dict)
-async def identify_waste():
-    """List all waste items"""
+async def identify_waste(sinceVersion: Optional[int] = Query(None, ge=0)):
+    """List waste items, or only those wasted after sinceVersion
+
+    Pass the returned wasteVersion as sinceVersion next time to fetch just the new ones.
+    """
     try:
-        waste_items = get_waste_items()
-        return JSONResponse(content={
+        # Read the version first: an item wasted meanwhile is repeated next time, never missed
+        version = get_waste_version()
+        waste_items = get_waste_items(WASTE_FIELDS, since_version=sinceVersion)
+        return FastJSONResponse(content={
             "success": True,
-            "wasteItems": waste_items
+            "wasteItems": waste_items,
+            "wasteVersion": version
         })
     
     except Exception as e:
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=500,
             content={"success": False, "message": f"Waste identification error: {str(e)}"}
         )
@@ -282,6 +601,7 @@ async def import_items(file: UploadFile = File(...)):
                     "mass": float(row.get("Mass", 0)),
                     "priority": int(row.get("Priority", 50)),
                     "expiryDate": row.get("Expiry Date"),
+                    "expiryAt": normalize_expiry(row.get("Expiry Date")),
                     "usageLimit": int(row.get("Usage Limit", 1)),
                     "preferredZone": row.get("Preferred Zone", "General"),
                     "status": "pending"
@@ -289,18 +609,21 @@ async def import_items(file: UploadFile = File(...)):
 
                 items_collection.insert_one(item)
                 imported += 1
+                change_feed.publish("item.imported", item["itemId"], **{
+                    k: v for k, v in item.items() if k not in ("_id", "itemId")
+                })
             
             except Exception as e:
                 errors.append({"row": idx, "message": str(e)})
 
-        return JSONResponse(content={
+        return FastJSONResponse(content={
             "success": True,
             "imported": imported,
             "errors": errors
         })
     
     except Exception as e:
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=500,
             content={"success": False, "message": f"Import error: {str(e)}"}
         )
@@ -309,7 +632,7 @@ async def import_items(file: UploadFile = File(...)):
 async def export_arrangement():
     """Export current arrangement as CSV"""
     try:
-        items = items_collection.find({"status": "stored"})
+        items = items_collection.for_operation("export").find({"status": "stored"}, EXPORT_FIELDS)
         
         csv_data = "Item ID,Container ID,Start W,Start D,Start H,End W,End D,End H\n"
         for item in items:
@@ -328,26 +651,100 @@ async def export_arrangement():
                 f"{end.get('height', 0)}\n"
             )
 
-        return JSONResponse(content={
+        return FastJSONResponse(content={
             "success": True,
             "csvData": csv_data
         })
     
     except Exception as e:
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=500,
             content={"success": False, "message": f"Export error: {str(e)}"}
         )
 
+### ✅ Change Feed Endpoints
+@app.get("/api/changes", response_model=dict)
+async def list_changes(since: int = Query(0, ge=0), epoch: Optional[str] = None):
+    """Poll for change events after a sequence number (of the given epoch, if known)"""
+    events, complete = change_feed.since(since, epoch)
+    return FastJSONResponse(content={
+        "success": True,
+        "events": events,
+        "epoch": change_feed.epoch,
+        "lastSeq": change_feed.seq,
+        "resync": not complete
+    })
+
+@app.get("/api/changes/stream")
+async def stream_changes(request: Request, since: Optional[str] = None):
+    """Server-Sent Events stream of changes; resumes from Last-Event-ID or ?since=
+
+    Both take the "epoch:seq" cursors the stream and GET /api/items hand out (or a bare seq).
+    """
+    try:
+        cursor = request.headers.get("last-event-id") or since
+        epoch, last_seq = parse_cursor(cursor) if cursor else (None, None)
+    except ValueError:
+        return FastJSONResponse(
+            status_code=400,
+            content={"success": False, "message": "Invalid change cursor"}
+        )
+
+    async def events():
+        # Tell new clients where the feed is, so they can resume from here
+        yield f"retry: 3000\nid: {cursor or change_feed.cursor()}\n\n"
+        async for event in change_feed.subscribe(last_seq, epoch):
+            if await request.is_disconnected():
+                break
+            yield format_sse(event, change_feed.epoch)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+### ✅ Admin Endpoints
+@app.get("/api/admin/profiles/{profile_id}", include_in_schema=False)
+async def get_profile(profile_id: str, request: Request):
+    """Return a stored request profile summary"""
+    if not is_admin(request.headers):
+        return FastJSONResponse(
+            status_code=403,
+            content={"success": False, "message": "Admin token required"}
+        )
+    profile = load_profile(profile_id)
+    if profile is None:
+        return FastJSONResponse(
+            status_code=404,
+            content={"success": False, "message": "Profile not found"}
+        )
+    return PlainTextResponse(profile)
+
 ### ✅ UI Endpoints
 @app.get("/", include_in_schema=False)
 async def serve_ui():
     return FileResponse("static/index.html")
 
 @app.get("/health")
+@app.get("/health/live")
 async def health_check():
+    """Liveness: the process is up and serving requests"""
     return {"status": "healthy", "timestamp": datetime.utcnow().isoformat()}
 
+@app.get("/health/ready")
+async def readiness_check():
+    """Readiness: the database is connected and indexed"""
+    status = database_status()
+    return FastJSONResponse(
+        status_code=200 if status["ready"] else 503,
+        content={
+            "status": "ready" if status["ready"] else "starting" if status["starting"] else "unavailable",
+            "database": status,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    )
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
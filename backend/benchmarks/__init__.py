@@ -0,0 +1,22 @@
+"""
+Benchmark harness for the optimization algorithms
+
+Contains:
+- generator: seeded synthetic containers and cargo manifests
+- run: timing/memory benchmarks for packing, retrieval, waste and simulation
+- loadtest: replays recorded or synthetic API traffic against the app
+
+Usage (from the repository root):
+    python -m backend.benchmarks.run --scenarios tiny,small --output bench.json
+    python -m backend.benchmarks.run --output new.json --compare bench.json
+    python -m backend.benchmarks.loadtest --requests 2000 --concurrency 16
+    python -m backend.benchmarks.loadtest --replay traffic.jsonl --realtime
+"""
+
+from .generator import generate_containers, generate_items, generate_manifest
+
+__all__ = [
+    'generate_containers',
+    'generate_items',
+    'generate_manifest'
+]
@@ -0,0 +1,98 @@
+import random
+from datetime import datetime, timedelta
+
+ZONES = [
+    'Crew Quarters', 'Airlock', 'Laboratory', 'Medical Bay', 'Storage Bay',
+    'Command Center', 'Engineering Bay', 'Power Bay', 'Maintenance Bay',
+    'Greenhouse', 'Sanitation Bay', 'Life Support'
+]
+
+ITEM_NAMES = [
+    'Food Packet', 'Oxygen Cylinder', 'First Aid Kit', 'Water Bottle',
+    'Research Sample', 'Spare Filter', 'Battery Pack', 'Wrench', 'Cable Bundle',
+    'Seed Kit', 'Medical Syringe', 'Hygiene Kit', 'Laptop', 'Camera'
+]
+
+# (share of items, min side, max side) - most cargo is small, a few items are bulky
+SIZE_CLASSES = [
+    (0.65, 1, 4),
+    (0.28, 3, 8),
+    (0.07, 6, 14),
+]
+
+# Roughly how many items a generated container is expected to hold
+ITEMS_PER_CONTAINER = 40
+
+SCENARIOS = {
+    'tiny': 100,
+    'small': 1000,
+    'medium': 10000,
+    'large': 100000,
+}
+
+
+def generate_containers(count, seed=0):
+    """Generate containers spread over the station zones"""
+    rng = random.Random(seed)
+    containers = []
+    for i in range(count):
+        zone = ZONES[i % len(ZONES)]
+        containers.append({
+            'containerId': f'cont{i:05d}',
+            'zone': zone,
+            'width': rng.randint(16, 30),
+            'depth': rng.randint(16, 30),
+            'height': rng.randint(20, 40),
+            'maxWeight': rng.choice([200.0, 500.0, 1000.0])
+        })
+    return containers
+
+
+def _item_size(rng):
+    roll = rng.random()
+    for share, low, high in SIZE_CLASSES:
+        if roll < share:
+            break
+        roll -= share
+    return rng.randint(low, high), rng.randint(low, high), rng.randint(low, high)
+
+
+def generate_items(count, zones=ZONES, seed=0, start_date=None):
+    """Generate a cargo manifest with realistic priorities, expiry and usage"""
+    rng = random.Random(seed + 1)
+    start_date = start_date or datetime(2025, 1, 1)
+    items = []
+    for i in range(count):
+        width, depth, height = _item_size(rng)
+        volume = width * depth * height
+        # Few critical items, many routine ones
+        priority = int(rng.triangular(1, 100, 40))
+        expiry = None
+        if rng.random() < 0.4:
+            expiry = (start_date + timedelta(days=rng.randint(1, 365))).date().isoformat()
+        items.append({
+            'itemId': f'item{i:06d}',
+            'name': rng.choice(ITEM_NAMES),
+            'width': width,
+            'depth': depth,
+            'height': height,
+            'mass': round(volume * rng.uniform(0.001, 0.01), 3),
+            'priority': priority,
+            'expiryDate': expiry,
+            'usageLimit': rng.randint(1, 100),
+            'preferredZone': rng.choice(zones),
+            'status': 'pending'
+        })
+    return items
+
+
+def generate_manifest(item_count, seed=0):
+    """Generate a matching set of containers and items"""
+    container_count = max(2, -(-item_count // ITEMS_PER_CONTAINER))
+    containers = generate_containers(container_count, seed=seed)
+    zones = sorted({c['zone'] for c in containers})
+    return {
+        'seed': seed,
+        'containers': containers,
+        'items': generate_items(item_count, zones=zones, seed=seed)
+    }
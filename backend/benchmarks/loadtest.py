@@ -0,0 +1,308 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from contextlib import AsyncExitStack
+from datetime import datetime
+
+from .generator import generate_items, generate_manifest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Relative weight of each request type in the synthetic mix
+DEFAULT_MIX = {
+    'items': 30,
+    'search': 25,
+    'retrieve': 25,
+    'import': 8,
+    'export': 4,
+    'simulate': 4,
+    'placement': 4,
+}
+
+CSV_HEADER = "Item ID,Name,Width,Depth,Height,Mass,Priority,Expiry Date,Usage Limit,Preferred Zone\n"
+
+
+def _csv(items):
+    rows = [
+        f"{i['itemId']},{i['name']},{i['width']},{i['depth']},{i['height']},{i['mass']},"
+        f"{i['priority']},{i['expiryDate'] or ''},{i['usageLimit']},{i['preferredZone']}\n"
+        for i in items
+    ]
+    return CSV_HEADER + "".join(rows)
+
+
+def import_request(items):
+    return {'name': 'import', 'method': 'POST', 'path': '/api/import/items',
+            'files': {'file': ['items.csv', _csv(items), 'text/csv']}}
+
+
+class SyntheticMix:
+    """Seeded stream of requests drawn from the mix weights
+
+    Item ids and names come from the seeded manifest, plus the items imported
+    during the run, so retrievals and searches hit real documents.
+    """
+
+    def __init__(self, manifest_items, mix=None, seed=0, batch=20):
+        self.rng = random.Random(seed)
+        self.mix = mix or DEFAULT_MIX
+        self.names = sorted({i['name'] for i in manifest_items})
+        self.ids = [i['itemId'] for i in manifest_items]
+        self.batch = batch
+        self._next_import = 0
+
+    def _import(self):
+        start = self._next_import
+        self._next_import += self.batch
+        items = generate_items(self.batch, seed=10_000 + start)
+        for n, item in enumerate(items):
+            item['itemId'] = f"load{start + n:07d}"
+        self.ids.extend(i['itemId'] for i in items)
+        return import_request(items)
+
+    def next(self):
+        kind = self.rng.choices(list(self.mix), weights=list(self.mix.values()))[0]
+        if kind == 'import':
+            return self._import()
+        if kind == 'items':
+            return {'name': kind, 'method': 'GET', 'path': '/api/items',
+                    'params': {'limit': 100, 'status': 'stored'}}
+        if kind == 'search':
+            return {'name': kind, 'method': 'GET', 'path': '/api/search',
+                    'params': {'itemName': self.rng.choice(self.names), 'userId': 'load'}}
+        if kind == 'retrieve':
+            return {'name': kind, 'method': 'POST', 'path': '/api/retrieve',
+                    'json': {'itemId': self.rng.choice(self.ids), 'userId': 'load'}}
+        if kind == 'simulate':
+            return {'name': kind, 'method': 'POST', 'path': '/api/simulate/day',
+                    'json': {'numDays': 1, 'itemsUsedPerDay': self.rng.sample(self.ids, min(5, len(self.ids)))}}
+        if kind == 'export':
+            return {'name': kind, 'method': 'GET', 'path': '/api/export/arrangement'}
+        if kind == 'placement':
+            return {'name': kind, 'method': 'POST', 'path': '/api/placement', 'params': {'dryRun': 'true'}}
+        raise ValueError(f"Unknown request type '{kind}'")
+
+
+def load_recording(path):
+    """Recorded traffic: one JSON request per line ({name?, method, path, params?, json?, files?, at?})"""
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+def summarize(samples, elapsed):
+    """Per-endpoint latency percentiles, throughput and error counts"""
+    report = {}
+    for name, entries in sorted(samples.items()):
+        latencies = sorted(e['latency'] for e in entries)
+        errors = sum(1 for e in entries if e['status'] is None or e['status'] >= 500)
+        rejected = sum(1 for e in entries if e['status'] is not None and 400 <= e['status'] < 500)
+        report[name] = {
+            'requests': len(entries),
+            'errors': errors,
+            'errorRate': errors / len(entries),
+            'clientErrors': rejected,
+            'throughput': len(entries) / elapsed if elapsed else None,
+            'p50': percentile(latencies, 50),
+            'p95': percentile(latencies, 95),
+            'p99': percentile(latencies, 99),
+            'max': latencies[-1],
+        }
+    return report
+
+
+class LoopLagMonitor:
+    """Measures how late a short sleep wakes up; long lags mean something blocked the event loop"""
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.lags = []
+        self._task = None
+
+    async def _run(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(0.0, time.perf_counter() - start - self.interval))
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        lags = sorted(self.lags)
+        return {'samples': len(lags), 'p99': percentile(lags, 99), 'max': lags[-1] if lags else None}
+
+
+async def _send(client, request):
+    files = request.get('files')
+    if files:
+        files = {field: tuple(value) for field, value in files.items()}
+    return await client.request(
+        request['method'], request['path'],
+        params=request.get('params'), json=request.get('json'), files=files
+    )
+
+
+async def replay(client, requests, concurrency, realtime=False):
+    """Send requests with `concurrency` workers; returns samples per endpoint and wall time"""
+    samples = defaultdict(list)
+    pending = iter(requests)
+    start = time.perf_counter()
+
+    async def worker():
+        for request in pending:
+            if realtime and request.get('at') is not None:
+                await asyncio.sleep(max(0.0, start + request['at'] - time.perf_counter()))
+            began = time.perf_counter()
+            try:
+                status = (await _send(client, request)).status_code
+            except Exception as e:
+                print(f"❌ {request['method']} {request['path']}: {e}")
+                status = None
+            samples[request.get('name', request['path'])].append({
+                'latency': time.perf_counter() - began,
+                'status': status
+            })
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples, time.perf_counter() - start
+
+
+async def _seed(client, items, containers):
+    """Load containers and the manifest, then store it with one placement job"""
+    from db.mongodb import containers_collection
+    containers_collection.insert_many([dict(c) for c in containers])
+    for i in range(0, len(items), 500):
+        response = await _send(client, import_request(items[i:i + 500]))
+        response.raise_for_status()
+
+    response = await client.post('/api/placement')
+    job = response.json().get('job') or {}
+    while job.get('status') in ('queued', 'running', 'cancelling'):
+        await asyncio.sleep(0.1)
+        job = (await client.get(f"/api/placement/jobs/{job['jobId']}")).json()['job']
+    print(f"🌱 Seeded {len(containers)} containers and {len(items)} items "
+          f"(placement {job.get('status')}, {job.get('progress', {}).get('placed', 0)} placed)")
+
+
+async def run_loadtest(args):
+    import httpx
+
+    manifest = generate_manifest(args.items, seed=args.seed)
+    manifest_items = manifest['items']
+    if args.replay:
+        requests = load_recording(args.replay)
+    else:
+        mix = SyntheticMix(manifest_items, mix=args.mix, seed=args.seed)
+        requests = [mix.next() for _ in range(args.requests)]
+    if args.save_mix:
+        with open(args.save_mix, 'w') as f:
+            for request in requests:
+                f.write(json.dumps(request) + "\n")
+        print(f"💾 Wrote {len(requests)} requests to {args.save_mix}")
+
+    async with AsyncExitStack() as stack:
+        if args.url:
+            app = None
+            client = httpx.AsyncClient(base_url=args.url, timeout=args.timeout)
+        else:
+            # In-process: the real app, in-memory storage, no sockets
+            os.environ.setdefault("CARGO_STORAGE", "memory")
+            if BACKEND_DIR not in sys.path:
+                sys.path.insert(0, BACKEND_DIR)
+            import api
+            app = api.app
+            await stack.enter_async_context(app.router.lifespan_context(app))
+            client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest",
+                                       timeout=args.timeout)
+        await stack.enter_async_context(client)
+
+        if app is not None and not args.no_seed:
+            await _seed(client, manifest_items, manifest['containers'])
+        monitor = LoopLagMonitor()
+        monitor.start()
+        samples, elapsed = await replay(client, requests, args.concurrency, realtime=args.realtime)
+        loop_lag = await monitor.stop()
+
+    return {
+        'timestamp': datetime.utcnow().isoformat(),
+        'target': args.url or 'in-process',
+        'requests': len(requests),
+        'concurrency': args.concurrency,
+        'seconds': elapsed,
+        'throughput': len(requests) / elapsed if elapsed else None,
+        'loopLag': loop_lag if app is not None else None,
+        'endpoints': summarize(samples, elapsed)
+    }
+
+
+def print_report(report):
+    print(f"⏱️  {report['requests']} requests at concurrency {report['concurrency']} "
+          f"in {report['seconds']:.2f}s ({report['throughput']:.1f} req/s)")
+    print(f"   {'endpoint':<12}{'count':>7}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}{'4xx':>6}")
+    for name, stats in report['endpoints'].items():
+        print(f"   {name:<12}{stats['requests']:>7}{stats['throughput']:>9.1f}"
+              f"{stats['p50'] * 1000:>9.1f}{stats['p95'] * 1000:>9.1f}{stats['p99'] * 1000:>9.1f}"
+              f"{stats['errors']:>8}{stats['clientErrors']:>6}")
+    lag = report['loopLag']
+    if lag and lag['samples']:
+        marker = '⚠️ ' if lag['max'] > 0.1 else '   '
+        print(f"{marker}event loop lag p99 {lag['p99'] * 1000:.1f} ms, max {lag['max'] * 1000:.1f} ms")
+
+
+def _parse_mix(value):
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        if name.strip() not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"unknown request type '{name}'")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay recorded or synthetic API traffic against the app")
+    parser.add_argument('--requests', type=int, default=2000, help="synthetic requests to send")
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--items', type=int, default=1000, help="manifest size to seed and draw ids from")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--mix', type=_parse_mix,
+                        help=f"weights like search=50,retrieve=30 (types: {', '.join(DEFAULT_MIX)})")
+    parser.add_argument('--replay', help="JSONL recording to replay instead of the synthetic mix")
+    parser.add_argument('--realtime', action='store_true',
+                        help="honour the 'at' offsets (seconds) of recorded requests")
+    parser.add_argument('--save-mix', help="write the requests that will be sent to this JSONL file")
+    parser.add_argument('--url', help="target a running server instead of the in-process app (no seeding)")
+    parser.add_argument('--no-seed', action='store_true', help="skip seeding the in-memory database")
+    parser.add_argument('--timeout', type=float, default=30.0)
+    parser.add_argument('--output', help="write JSON results to this file")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run_loadtest(args))
+    print_report(report)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Results written to {args.output}")
+    return report
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,235 @@
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from ..algorithms import PriorityBinPacker, RetrievalPathFinder, WasteOptimizer, ZonePartitionedPacker
+from ..models.cargo_system import CargoSystem
+from .generator import SCENARIOS, generate_manifest
+
+DEFAULT_SCENARIOS = ['tiny', 'small']
+
+# tracemalloc slows allocation-heavy code noticeably; --no-memory turns it off
+TRACE_MEMORY = True
+
+
+def measure(fn, *args, **kwargs):
+    """Run fn once and return (result, wall seconds, peak traced bytes)"""
+    if TRACE_MEMORY:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        result = fn(*args, **kwargs)
+    finally:
+        elapsed = time.perf_counter() - start
+        peak = None
+        if TRACE_MEMORY:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def bench_packing(manifest, block_building=False, workers=None, scoring='depth'):
+    """Pack the whole manifest into fresh containers (zone-partitioned when workers is set)"""
+    def run():
+        if workers:
+            packer = ZonePartitionedPacker(manifest['containers'], max_workers=workers, scoring=scoring)
+        else:
+            packer = PriorityBinPacker(manifest['containers'], scoring=scoring)
+        results = list(packer.pack_items(manifest['items'], block_building=block_building))
+        return packer, results
+
+    (packer, results), elapsed, peak = measure(run)
+    placed = [r for r in results if 'container' in r]
+    imbalance = [c['space'].imbalance() for c in packer.containers.values() if c['space'].total_mass]
+    return packer, placed, {
+        'seconds': elapsed,
+        'peakBytes': peak,
+        'items': len(manifest['items']),
+        'placed': len(placed),
+        'meanImbalance': float(sum(imbalance) / len(imbalance)) if imbalance else None,
+        'itemsPerSecond': len(manifest['items']) / elapsed if elapsed else None
+    }
+
+
+def bench_retrieval(packer, placed, sample_size=500):
+    """Compute retrieval paths for a sample of stored items"""
+    sample = placed[::max(1, len(placed) // sample_size)][:sample_size]
+    finders = {
+        cid: RetrievalPathFinder(container['space'])
+        for cid, container in packer.containers.items()
+    }
+
+    def run():
+        steps = 0
+        for placement in sample:
+            path = finders[placement['container']].find_retrieval_path(placement['item']['itemId'])
+            steps += len(path)
+        return steps
+
+    steps, elapsed, peak = measure(run)
+    return {
+        'seconds': elapsed,
+        'peakBytes': peak,
+        'lookups': len(sample),
+        'totalSteps': steps,
+        'lookupsPerSecond': len(sample) / elapsed if elapsed else None
+    }
+
+
+def bench_waste(manifest, placed, max_weight=1000):
+    """Build a return plan for every placed item flagged as waste"""
+    waste_items = [{
+        **p['item'],
+        'volume': p['item']['width'] * p['item']['depth'] * p['item']['height'],
+        'target_container': p['container']
+    } for p in placed]
+    optimizer = WasteOptimizer(manifest['containers'])
+
+    bins, elapsed, peak = measure(optimizer.generate_return_plan, waste_items, max_weight)
+    return {
+        'seconds': elapsed,
+        'peakBytes': peak,
+        'wasteItems': len(waste_items),
+        'bins': len(bins)
+    }
+
+
+def bench_simulation(manifest, placed, days=30):
+    """Advance a populated CargoSystem by a number of days"""
+    system = CargoSystem(manifest['containers'])
+    for p in placed:
+        item = p['item']
+        system.containers[p['container']].add_item(item['itemId'], p['position'])
+        system.items[item['itemId']] = {
+            **item,
+            'containerId': p['container'],
+            'position': p['position'],
+            'volume': item['width'] * item['depth'] * item['height'],
+            'remaining_uses': item['usageLimit']
+        }
+
+    status, elapsed, peak = measure(system.simulate_time, days)
+    return {
+        'seconds': elapsed,
+        'peakBytes': peak,
+        'days': days,
+        'itemsBefore': len(placed),
+        'itemsAfter': status['total_items']
+    }
+
+
+def run_scenario(name, item_count, seed=0, days=30, block_building=False, workers=None, scoring='depth'):
+    """Run every benchmark against one generated manifest"""
+    manifest = generate_manifest(item_count, seed=seed)
+    print(f"⏱️  {name}: {item_count} items, {len(manifest['containers'])} containers")
+
+    packer, placed, packing = bench_packing(manifest, block_building=block_building, workers=workers,
+                                            scoring=scoring)
+    print(f"   packing    {packing['seconds']:.3f}s ({packing['placed']}/{item_count} placed, "
+          f"imbalance {packing['meanImbalance'] or 0:.3f})")
+    retrieval = bench_retrieval(packer, placed)
+    print(f"   retrieval  {retrieval['seconds']:.3f}s ({retrieval['lookups']} lookups)")
+    waste = bench_waste(manifest, placed)
+    print(f"   waste      {waste['seconds']:.3f}s ({waste['bins']} bins)")
+    simulation = bench_simulation(manifest, placed, days=days)
+    print(f"   simulation {simulation['seconds']:.3f}s ({days} days)")
+
+    return {
+        'scenario': name,
+        'items': item_count,
+        'containers': len(manifest['containers']),
+        'seed': seed,
+        'results': {
+            'packing': packing,
+            'retrieval': retrieval,
+            'waste': waste,
+            'simulation': simulation
+        }
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, baseline):
+    """Print per-benchmark time ratios against an earlier results file"""
+    previous = {s['scenario']: s for s in baseline['scenarios']}
+    for scenario in current['scenarios']:
+        old = previous.get(scenario['scenario'])
+        if not old:
+            continue
+        for bench, result in scenario['results'].items():
+            old_result = old['results'].get(bench)
+            if not old_result or not old_result['seconds']:
+                continue
+            ratio = result['seconds'] / old_result['seconds']
+            marker = '🔺' if ratio > 1.1 else '🔻' if ratio < 0.9 else '  '
+            print(f"{marker} {scenario['scenario']:>6} {bench:<10} "
+                  f"{old_result['seconds']:.3f}s -> {result['seconds']:.3f}s ({ratio:.2f}x)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cargo algorithm benchmarks")
+    parser.add_argument('--scenarios', default=','.join(DEFAULT_SCENARIOS),
+                        help=f"comma separated subset of {', '.join(SCENARIOS)} or item counts")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--days', type=int, default=30, help="days to simulate")
+    parser.add_argument('--block-building', action='store_true',
+                        help="pack runs of identical items as layered blocks")
+    parser.add_argument('--workers', type=int,
+                        help="pack zones in parallel with this many worker processes")
+    parser.add_argument('--scoring', choices=['depth', 'balance'], default='depth',
+                        help="placement scoring; balance also keeps centres of mass central")
+    parser.add_argument('--no-memory', action='store_true',
+                        help="skip tracemalloc peak memory tracking (more accurate timings)")
+    parser.add_argument('--output', help="write JSON results to this file")
+    parser.add_argument('--compare', help="JSON results from an earlier run to compare against")
+    args = parser.parse_args(argv)
+
+    global TRACE_MEMORY
+    TRACE_MEMORY = not args.no_memory
+
+    scenarios = []
+    for name in args.scenarios.split(','):
+        name = name.strip()
+        count = SCENARIOS[name] if name in SCENARIOS else int(name)
+        scenarios.append(run_scenario(name, count, seed=args.seed, days=args.days,
+                                      block_building=args.block_building, workers=args.workers,
+                                      scoring=args.scoring))
+
+    report = {
+        'timestamp': datetime.utcnow().isoformat(),
+        'commit': _git_commit(),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'traceMemory': TRACE_MEMORY,
+        'blockBuilding': args.block_building,
+        'workers': args.workers,
+        'scoring': args.scoring,
+        'scenarios': scenarios
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Results written to {args.output}")
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+    return report
+
+
+if __name__ == "__main__":
+    main()
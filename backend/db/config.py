@@ -0,0 +1,60 @@
+import os
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value not in (None, "") else default
+
+
+def _env_list(name, default=None):
+    value = os.environ.get(name)
+    if not value:
+        return default
+    return [part.strip() for part in value.split(",") if part.strip()]
+
+
+# "mongo" or "memory"; memory keeps everything in-process (offline load tests, single-node use)
+STORAGE_BACKEND = os.environ.get("CARGO_STORAGE", "mongo").lower()
+
+# Client-wide settings; every value can be overridden from the environment
+MONGO_SETTINGS = {
+    "uri": os.environ.get("MONGO_URI", "mongodb://localhost:27017/"),
+    "database": os.environ.get("MONGO_DB", "space_station"),
+    "maxPoolSize": _env_int("MONGO_MAX_POOL_SIZE", 100),
+    "minPoolSize": _env_int("MONGO_MIN_POOL_SIZE", 4),
+    "maxIdleTimeMS": _env_int("MONGO_MAX_IDLE_TIME_MS", 300000),
+    "waitQueueTimeoutMS": _env_int("MONGO_WAIT_QUEUE_TIMEOUT_MS", 5000),
+    "connectTimeoutMS": _env_int("MONGO_CONNECT_TIMEOUT_MS", 5000),
+    "socketTimeoutMS": _env_int("MONGO_SOCKET_TIMEOUT_MS", 30000),
+    "serverSelectionTimeoutMS": _env_int("MONGO_SERVER_SELECTION_TIMEOUT_MS", 5000),
+    # e.g. "zstd,snappy,zlib" - zstd and snappy need their optional python packages
+    "compressors": _env_list("MONGO_COMPRESSORS"),
+}
+
+# Once startup gives up, reconnects back off exponentially up to this many seconds apart
+RECONNECT_MAX_DELAY = _env_int("MONGO_RECONNECT_MAX_DELAY", 60)
+
+# Read routing and durability per class of operation:
+# - search/export are read-heavy and tolerate slightly stale data, so they may use secondaries
+# - placement commits must survive failover, audit logs only need to reach the primary
+OPERATION_CLASSES = {
+    "default": {"readPreference": "primary", "writeConcern": None},
+    "search": {"readPreference": "secondaryPreferred", "writeConcern": None},
+    "export": {"readPreference": "secondaryPreferred", "writeConcern": None},
+    "placement": {"readPreference": "primary", "writeConcern": "majority"},
+    "audit": {"readPreference": "primary", "writeConcern": "1"},
+}
+
+# MONGO_<CLASS>_READ_PREFERENCE / MONGO_<CLASS>_WRITE_CONCERN override the table above
+for _name, _options in OPERATION_CLASSES.items():
+    _prefix = f"MONGO_{_name.upper()}_"
+    _options["readPreference"] = os.environ.get(_prefix + "READ_PREFERENCE", _options["readPreference"])
+    _options["writeConcern"] = os.environ.get(_prefix + "WRITE_CONCERN", _options["writeConcern"])
+
+
+def client_options():
+    """Keyword arguments for MongoClient built from MONGO_SETTINGS"""
+    return {
+        key: value for key, value in MONGO_SETTINGS.items()
+        if key not in ("uri", "database") and value is not None
+    }
@@ -0,0 +1,732 @@
+import copy
+import re
+import threading
+import uuid
+from bisect import bisect_left, bisect_right
+
+try:
+    from pymongo.errors import DuplicateKeyError
+except ImportError:  # the memory backend works without pymongo installed
+    class DuplicateKeyError(Exception):
+        pass
+
+_MISSING = object()
+
+
+class Result:
+    """Stand-in for pymongo's InsertOneResult/UpdateResult/DeleteResult"""
+
+    def __init__(self, **fields):
+        self.acknowledged = True
+        self.__dict__.update(fields)
+
+
+def _get_path(doc, path):
+    """Resolve a dotted field path, returning _MISSING if absent"""
+    value = doc
+    for part in path.split("."):
+        if isinstance(value, dict) and part in value:
+            value = value[part]
+        else:
+            return _MISSING
+    return value
+
+
+def _set_path(doc, path, value):
+    parts = path.split(".")
+    for part in parts[:-1]:
+        doc = doc.setdefault(part, {})
+    doc[parts[-1]] = value
+
+
+def _unset_path(doc, path):
+    parts = path.split(".")
+    for part in parts[:-1]:
+        doc = doc.get(part)
+        if not isinstance(doc, dict):
+            return
+    doc.pop(parts[-1], None)
+
+
+def _compare(value, op, target):
+    """Ordered comparison; values of unrelated types never match, like Mongo's type brackets"""
+    if value is _MISSING or value is None or target is None:
+        return False
+    try:
+        if op == "$lt":
+            return value < target
+        if op == "$lte":
+            return value <= target
+        if op == "$gt":
+            return value > target
+        return value >= target
+    except TypeError:
+        return False
+
+
+def _match_condition(value, condition):
+    if not isinstance(condition, dict) or not any(k.startswith("$") for k in condition):
+        if isinstance(value, list) and not isinstance(condition, list):
+            return condition in value
+        return (None if value is _MISSING else value) == condition
+
+    for op, target in condition.items():
+        if op == "$eq":
+            matched = _match_condition(value, target)
+        elif op == "$ne":
+            matched = not _match_condition(value, target)
+        elif op in ("$lt", "$lte", "$gt", "$gte"):
+            matched = _compare(value, op, target)
+        elif op == "$in":
+            matched = any(_match_condition(value, t) for t in target)
+        elif op == "$nin":
+            matched = not any(_match_condition(value, t) for t in target)
+        elif op == "$exists":
+            matched = (value is not _MISSING) == bool(target)
+        elif op == "$regex":
+            flags = re.IGNORECASE if "i" in condition.get("$options", "") else 0
+            matched = isinstance(value, str) and re.search(target, value, flags) is not None
+        elif op == "$options":
+            matched = True
+        else:
+            raise ValueError(f"Unsupported query operator {op}")
+        if not matched:
+            return False
+    return True
+
+
+def matches(doc, query):
+    """Evaluate a Mongo-style filter against a document"""
+    for key, condition in (query or {}).items():
+        if key == "$and":
+            if not all(matches(doc, q) for q in condition):
+                return False
+        elif key == "$or":
+            if not any(matches(doc, q) for q in condition):
+                return False
+        elif key == "$nor":
+            if any(matches(doc, q) for q in condition):
+                return False
+        elif not _match_condition(_get_path(doc, key), condition):
+            return False
+    return True
+
+
+def _is_inclusion(projection):
+    """True for inclusion projections ({"a": 1}, {"_id": 1}); mixing the two kinds is an error"""
+    fields = {k: v for k, v in projection.items() if k != "_id"}
+    if not fields:
+        return bool(projection.get("_id", 1))
+    if all(fields.values()):
+        return True
+    if any(fields.values()):
+        raise ValueError("Cannot mix inclusion and exclusion in a projection")
+    return False
+
+
+def project(doc, projection):
+    """Apply an inclusion or exclusion projection to a copy of doc"""
+    if not projection:
+        return copy.deepcopy(doc)
+    if isinstance(projection, (list, tuple)):
+        projection = {field: 1 for field in projection}
+    include_id = projection.get("_id", 1)
+    fields = {k: v for k, v in projection.items() if k != "_id"}
+
+    if _is_inclusion(projection):
+        result = {}
+        for path in fields:
+            value = _get_path(doc, path)
+            if value is not _MISSING:
+                _set_path(result, path, copy.deepcopy(value))
+        if include_id and "_id" in doc:
+            result["_id"] = doc["_id"]
+        return result
+
+    result = copy.deepcopy(doc)
+    for path in fields:
+        _unset_path(result, path)
+    if not include_id:
+        result.pop("_id", None)
+    return result
+
+
+def _agg_key(value):
+    # Aggregation comparisons order missing/null first, then by type bracket
+    return _sort_key(None if value is _MISSING else value)
+
+
+def evaluate(expression, doc):
+    """Evaluate an aggregation expression against doc (the subset update pipelines use)
+
+    Supports "$field" paths, $$REMOVE, $literal, $cond, $ifNull, comparisons and
+    $add/$subtract. Returns _MISSING for absent fields and $$REMOVE.
+    """
+    if isinstance(expression, str):
+        if expression == "$$REMOVE":
+            return _MISSING
+        if expression.startswith("$$"):
+            raise ValueError(f"Unsupported variable {expression}")
+        if expression.startswith("$"):
+            return _get_path(doc, expression[1:])
+        return expression
+    if isinstance(expression, list):
+        return [evaluate(e, doc) for e in expression]
+    if not isinstance(expression, dict):
+        return expression
+    if len(expression) != 1 or not next(iter(expression)).startswith("$"):
+        result = {}
+        for key, value in expression.items():
+            value = evaluate(value, doc)
+            if value is not _MISSING:
+                result[key] = value
+        return result
+
+    op, args = next(iter(expression.items()))
+    if op == "$literal":
+        return args
+    if op == "$cond":
+        if isinstance(args, dict):
+            args = [args["if"], args["then"], args["else"]]
+        condition = evaluate(args[0], doc)
+        return evaluate(args[1] if condition not in (_MISSING, None, False, 0) else args[2], doc)
+    if op == "$ifNull":
+        for arg in args:
+            value = evaluate(arg, doc)
+            if value not in (_MISSING, None):
+                return value
+        return None
+    values = [evaluate(arg, doc) for arg in (args if isinstance(args, list) else [args])]
+    if op in ("$eq", "$ne", "$lt", "$lte", "$gt", "$gte"):
+        a, b = (_agg_key(v) for v in values)
+        return {"$eq": a == b, "$ne": a != b, "$lt": a < b,
+                "$lte": a <= b, "$gt": a > b, "$gte": a >= b}[op]
+    if op in ("$add", "$subtract"):
+        if any(v in (_MISSING, None) for v in values):
+            return None
+        return sum(values) if op == "$add" else values[0] - values[1]
+    raise ValueError(f"Unsupported expression operator {op}")
+
+
+def _apply_pipeline(doc, stages):
+    """Apply an update pipeline of $set/$addFields/$unset stages to doc in place"""
+    for stage in stages:
+        for op, fields in stage.items():
+            if op in ("$set", "$addFields"):
+                # Every field in a stage sees the document as it was before the stage
+                values = {path: evaluate(expression, doc) for path, expression in fields.items()}
+                for path, value in values.items():
+                    if value is _MISSING:
+                        _unset_path(doc, path)
+                    else:
+                        _set_path(doc, path, copy.deepcopy(value))
+            elif op == "$unset":
+                for path in [fields] if isinstance(fields, str) else fields:
+                    _unset_path(doc, path)
+            else:
+                raise ValueError(f"Unsupported update pipeline stage {op}")
+
+
+def apply_update(doc, update, inserting=False):
+    """Apply $set/$inc/$unset/$setOnInsert/$push/$min/$max, or an update pipeline, to doc in place"""
+    if isinstance(update, list):
+        _apply_pipeline(doc, update)
+        return
+    for op, fields in update.items():
+        for path, value in fields.items():
+            if op == "$set" or (op == "$setOnInsert" and inserting):
+                _set_path(doc, path, copy.deepcopy(value))
+            elif op == "$setOnInsert":
+                continue
+            elif op == "$inc":
+                current = _get_path(doc, path)
+                _set_path(doc, path, (0 if current is _MISSING else current) + value)
+            elif op == "$unset":
+                _unset_path(doc, path)
+            elif op == "$push":
+                current = _get_path(doc, path)
+                _set_path(doc, path, ([] if current is _MISSING else current) + [copy.deepcopy(value)])
+            elif op in ("$min", "$max"):
+                current = _get_path(doc, path)
+                # Compared in BSON order, so null is below any number
+                if (current is _MISSING
+                        or (op == "$min" and _sort_key(value) < _sort_key(current))
+                        or (op == "$max" and _sort_key(value) > _sort_key(current))):
+                    _set_path(doc, path, value)
+            else:
+                raise ValueError(f"Unsupported update operator {op}")
+
+
+def _type_bracket(value):
+    """Values compare only within a bracket; ints and floats share one"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return "number"
+    return type(value).__name__
+
+
+def _sort_key(value):
+    # Missing/None sort first, then by type bracket so mixed types don't raise
+    if value is _MISSING or value is None:
+        return (0, "", 0)
+    return (1, _type_bracket(value), value)
+
+
+class MemoryCursor:
+    """Lazy cursor supporting sort/skip/limit like pymongo's Cursor"""
+
+    def __init__(self, collection, query, projection):
+        self._collection = collection
+        self._query = query
+        self._projection = projection
+        self._sort = []
+        self._skip = 0
+        self._limit = 0
+
+    def sort(self, key, direction=1):
+        self._sort = [(key, direction)] if isinstance(key, str) else list(key)
+        return self
+
+    def skip(self, count):
+        self._skip = count
+        return self
+
+    def limit(self, count):
+        self._limit = count
+        return self
+
+    def __iter__(self):
+        docs = self._collection._find_docs(self._query)
+        for key, direction in reversed(self._sort):
+            docs.sort(key=lambda d: _sort_key(_get_path(d, key)), reverse=direction < 0)
+        end = self._skip + self._limit if self._limit else None
+        for doc in docs[self._skip:end]:
+            yield project(doc, self._projection)
+
+
+class _Top:
+    """Sorts after every value, to bound key ranges"""
+
+    def __lt__(self, other):
+        return False
+
+    def __le__(self, other):
+        return self is other
+
+    def __gt__(self, other):
+        return self is not other
+
+    def __ge__(self, other):
+        return True
+
+
+_TOP = _Top()
+_RANGE_OPS = ("$lt", "$lte", "$gt", "$gte")
+
+
+def _index_value(value):
+    """Orderable, hashable form of one key part: missing/null first, then by type bracket"""
+    if isinstance(value, (dict, list)):
+        return (1, type(value).__name__, repr(value))
+    return _sort_key(value)
+
+
+class MemoryIndex:
+    """Index on one or more fields, kept as a sorted list of key tuples
+
+    Like Mongo, a query can use a leading run of equality ($eq/$in) conditions,
+    optionally followed by one range condition on the next field.
+    """
+
+    def __init__(self, fields, unique=False):
+        self.fields = tuple(fields)
+        self.unique = unique
+        self.entries = {}   # key tuple -> set of document ids
+        self._keys = []     # the same key tuples, sorted
+        self.multikey = False
+
+    def key(self, doc):
+        values = []
+        for field in self.fields:
+            value = _get_path(doc, field)
+            if isinstance(value, list):
+                # Array fields need multikey semantics, which this index doesn't have
+                self.multikey = True
+            values.append(_index_value(None if value is _MISSING else value))
+        return tuple(values)
+
+    def add(self, doc_id, key):
+        ids = self.entries.get(key)
+        if ids is None:
+            ids = self.entries[key] = set()
+            self._keys.insert(bisect_left(self._keys, key), key)
+        ids.add(doc_id)
+
+    def remove(self, doc_id, key):
+        ids = self.entries.get(key)
+        if ids is not None:
+            ids.discard(doc_id)
+            if not ids:
+                del self.entries[key]
+                del self._keys[bisect_left(self._keys, key)]
+
+    def clear(self):
+        self.entries = {}
+        self._keys = []
+        self.multikey = False
+
+    def lookup(self, query):
+        """Candidate ids for query, or None if the index can't narrow it"""
+        if self.multikey:
+            return None
+        prefixes = [()]
+        bounds = None
+        for field in self.fields:
+            condition = query.get(field, _MISSING)
+            if condition is _MISSING:
+                break
+            values = self._equality_values(condition)
+            if values is None:
+                bounds = self._bounds(condition)
+                break
+            prefixes = [prefix + (_index_value(v),) for prefix in prefixes for v in values]
+        if bounds is None and not prefixes[0]:
+            return None
+        ids = set()
+        for prefix in prefixes:
+            lo, hi = self._span(prefix, bounds)
+            for key in self._keys[lo:hi]:
+                ids |= self.entries[key]
+        return ids
+
+    @staticmethod
+    def _equality_values(condition):
+        if not isinstance(condition, dict) or not any(k.startswith("$") for k in condition):
+            return None if isinstance(condition, list) else [condition]
+        if set(condition) == {"$eq"}:
+            return [condition["$eq"]]
+        if set(condition) == {"$in"} and not any(isinstance(v, (list, dict)) for v in condition["$in"]):
+            return list(condition["$in"])
+        return None
+
+    @staticmethod
+    def _bounds(condition):
+        """Range operators of a condition on one type bracket, or None if it has others"""
+        if not isinstance(condition, dict) or not condition or any(op not in _RANGE_OPS for op in condition):
+            return None
+        brackets = {_type_bracket(v) for v in condition.values()}
+        if len(brackets) != 1 or None in condition.values():
+            return None
+        return condition
+
+    def _span(self, prefix, bounds):
+        """Slice of _keys that starts with prefix and, given bounds, whose next part is in range"""
+        keys = self._keys
+        if bounds is None:
+            return bisect_left(keys, prefix), bisect_left(keys, prefix + (_TOP,))
+        bracket = _type_bracket(next(iter(bounds.values())))
+        lo = bisect_left(keys, prefix + ((1, bracket),))
+        hi = bisect_left(keys, prefix + ((1, bracket, _TOP),))
+        for op, value in bounds.items():
+            part = prefix + (_index_value(value),)
+            if op == "$gt":
+                lo = max(lo, bisect_left(keys, part + (_TOP,)))
+            elif op == "$gte":
+                lo = max(lo, bisect_left(keys, part))
+            elif op == "$lt":
+                hi = min(hi, bisect_left(keys, part))
+            else:
+                hi = min(hi, bisect_left(keys, part + (_TOP,)))
+        return lo, max(lo, hi)
+
+
+class MemoryCollection:
+    """In-process collection implementing the pymongo calls the API uses"""
+
+    def __init__(self, name):
+        self.name = name
+        self._docs = {}
+        self._indexes = {}
+        self._seq = 0
+        self._lock = threading.RLock()
+
+    # --- indexes ---
+    def create_index(self, keys, unique=False, name=None, **kwargs):
+        if isinstance(keys, str):
+            keys = [(keys, 1)]
+        name = name or "_".join(f"{k}_{d}" for k, d in keys)
+        with self._lock:
+            # Key direction only matters for sorting, which the index isn't used for
+            index = MemoryIndex([k for k, _ in keys], unique=unique)
+            for doc_id, doc in self._docs.items():
+                key = index.key(doc)
+                if index.unique and index.entries.get(key):
+                    raise DuplicateKeyError(f"E11000 duplicate key {index.fields}: {key}")
+                index.add(doc_id, key)
+            self._indexes[name] = index
+        return name
+
+    def index_information(self):
+        return {name: {"key": [(field, 1) for field in index.fields], "unique": index.unique}
+                for name, index in self._indexes.items()}
+
+    def drop_indexes(self):
+        with self._lock:
+            self._indexes = {}
+
+    def _index_add(self, doc_id, doc):
+        keys = [(index, index.key(doc)) for index in self._indexes.values()]
+        for index, key in keys:
+            if index.unique and index.entries.get(key, set()) - {doc_id}:
+                raise DuplicateKeyError(f"E11000 duplicate key {index.fields}: {key}")
+        for index, key in keys:
+            index.add(doc_id, key)
+
+    def _index_remove(self, doc_id, doc):
+        for index in self._indexes.values():
+            index.remove(doc_id, index.key(doc))
+
+    # --- queries ---
+    def _candidate_ids(self, query):
+        """Narrow the scan using the most selective usable index"""
+        best = None
+        for index in self._indexes.values():
+            ids = index.lookup(query or {})
+            if ids is not None and (best is None or len(ids) < len(best)):
+                best = ids
+        return best
+
+    def _find_docs(self, query, limit=0):
+        with self._lock:
+            ids = self._candidate_ids(query)
+            if ids is None:
+                candidates = self._docs.items()
+            else:
+                # Keep insertion order so results match a full scan
+                candidates = sorted(((i, self._docs[i]) for i in ids), key=lambda e: e[1]["_seq"])
+            docs = []
+            for _, doc in candidates:
+                if matches(doc, query):
+                    docs.append(doc)
+                    if limit and len(docs) >= limit:
+                        break
+            return docs
+
+    def find(self, filter=None, projection=None, **kwargs):
+        cursor = MemoryCursor(self, filter or {}, self._public(projection))
+        if kwargs.get("sort"):
+            cursor.sort(kwargs["sort"])
+        if kwargs.get("limit"):
+            cursor.limit(kwargs["limit"])
+        return cursor
+
+    def find_one(self, filter=None, projection=None, **kwargs):
+        if kwargs.get("sort"):
+            return next(iter(self.find(filter, projection, sort=kwargs["sort"]).limit(1)), None)
+        docs = self._find_docs(filter or {}, limit=1)
+        return project(docs[0], self._public(projection)) if docs else None
+
+    def count_documents(self, filter=None, **kwargs):
+        return len(self._find_docs(filter or {}))
+
+    def estimated_document_count(self):
+        return len(self._docs)
+
+    def distinct(self, key, filter=None):
+        values = []
+        for doc in self._find_docs(filter or {}):
+            value = _get_path(doc, key)
+            if value is not _MISSING and value not in values:
+                values.append(value)
+        return values
+
+    # --- writes ---
+    def insert_one(self, document):
+        with self._lock:
+            self._insert(document)
+        return Result(inserted_id=document["_id"])
+
+    def insert_many(self, documents, ordered=True):
+        inserted = []
+        with self._lock:
+            for document in documents:
+                try:
+                    self._insert(document)
+                    inserted.append(document["_id"])
+                except DuplicateKeyError:
+                    if ordered:
+                        raise
+        return Result(inserted_ids=inserted)
+
+    def _insert(self, document):
+        # Like pymongo, the caller's document gets its generated _id
+        document.setdefault("_id", uuid.uuid4().hex)
+        if document["_id"] in self._docs:
+            raise DuplicateKeyError(f"E11000 duplicate key _id: {document['_id']}")
+        stored = copy.deepcopy(document)
+        self._seq += 1
+        stored["_seq"] = self._seq
+        self._index_add(stored["_id"], stored)
+        self._docs[stored["_id"]] = stored
+
+    def _modify(self, doc, update):
+        """Apply update to one stored document, keeping indexes and constraints consistent"""
+        doc_id = doc["_id"]
+        updated = copy.deepcopy(doc)
+        if isinstance(update, list) or any(k.startswith("$") for k in update):
+            apply_update(updated, update)
+        else:
+            updated = {**copy.deepcopy(update), "_id": doc_id, "_seq": doc["_seq"]}
+        self._index_remove(doc_id, doc)
+        try:
+            self._index_add(doc_id, updated)
+        except DuplicateKeyError:
+            self._index_add(doc_id, doc)
+            raise
+        self._docs[doc_id] = updated
+        return updated, updated != doc
+
+    def _upsert(self, filter, update):
+        document = {k: v for k, v in filter.items()
+                    if not k.startswith("$") and not isinstance(v, dict)}
+        if isinstance(update, list) or any(k.startswith("$") for k in update):
+            apply_update(document, update, inserting=True)
+        else:
+            document.update(copy.deepcopy(update))
+        self._insert(document)
+        return document
+
+    def update_one(self, filter, update, upsert=False, **kwargs):
+        with self._lock:
+            docs = self._find_docs(filter, limit=1)
+            if docs:
+                _, changed = self._modify(docs[0], update)
+                return Result(matched_count=1, modified_count=int(changed), upserted_id=None)
+            if upsert:
+                document = self._upsert(filter, update)
+                return Result(matched_count=0, modified_count=0, upserted_id=document["_id"])
+        return Result(matched_count=0, modified_count=0, upserted_id=None)
+
+    def update_many(self, filter, update, upsert=False, **kwargs):
+        with self._lock:
+            docs = self._find_docs(filter)
+            modified = 0
+            for doc in docs:
+                _, changed = self._modify(doc, update)
+                modified += changed
+            if not docs and upsert:
+                document = self._upsert(filter, update)
+                return Result(matched_count=0, modified_count=0, upserted_id=document["_id"])
+        return Result(matched_count=len(docs), modified_count=modified, upserted_id=None)
+
+    def replace_one(self, filter, replacement, upsert=False, **kwargs):
+        return self.update_one(filter, replacement, upsert=upsert)
+
+    def bulk_write(self, requests, ordered=True, **kwargs):
+        """Apply pymongo write models (InsertOne, UpdateOne, UpdateMany, ReplaceOne, DeleteOne, DeleteMany)"""
+        totals = {"inserted_count": 0, "matched_count": 0, "modified_count": 0,
+                  "deleted_count": 0, "upserted_count": 0}
+        with self._lock:
+            for request in requests:
+                kind = type(request).__name__
+                try:
+                    if kind == "InsertOne":
+                        self.insert_one(request._doc)
+                        totals["inserted_count"] += 1
+                        continue
+                    if kind in ("DeleteOne", "DeleteMany"):
+                        delete = self.delete_one if kind == "DeleteOne" else self.delete_many
+                        totals["deleted_count"] += delete(request._filter).deleted_count
+                        continue
+                    if kind not in ("UpdateOne", "UpdateMany", "ReplaceOne"):
+                        raise ValueError(f"Unsupported bulk operation {kind}")
+                    update = self.update_many if kind == "UpdateMany" else self.update_one
+                    result = update(request._filter, request._doc, upsert=bool(request._upsert))
+                except DuplicateKeyError:
+                    if ordered:
+                        raise
+                    continue
+                totals["matched_count"] += result.matched_count
+                totals["modified_count"] += result.modified_count
+                totals["upserted_count"] += int(result.upserted_id is not None)
+        return Result(**totals)
+
+    def find_one_and_update(self, filter, update, projection=None, return_document=False,
+                            upsert=False, sort=None, **kwargs):
+        """Atomic read-modify-write; return_document=True (ReturnDocument.AFTER) returns the new version"""
+        with self._lock:
+            if sort:
+                docs = [self._docs[d["_id"]] for d in self.find(filter, {"_id": 1}, sort=sort).limit(1)]
+            else:
+                docs = self._find_docs(filter, limit=1)
+            if docs:
+                updated, _ = self._modify(docs[0], update)
+                return project(updated if return_document else docs[0], self._public(projection))
+            if upsert:
+                document = self._upsert(filter, update)
+                return project(self._docs[document["_id"]], self._public(projection)) if return_document else None
+        return None
+
+    def delete_one(self, filter):
+        with self._lock:
+            docs = self._find_docs(filter, limit=1)
+            for doc in docs:
+                self._index_remove(doc["_id"], doc)
+                del self._docs[doc["_id"]]
+        return Result(deleted_count=len(docs))
+
+    def delete_many(self, filter):
+        with self._lock:
+            docs = self._find_docs(filter or {})
+            for doc in docs:
+                self._index_remove(doc["_id"], doc)
+                del self._docs[doc["_id"]]
+        return Result(deleted_count=len(docs))
+
+    def drop(self):
+        with self._lock:
+            self._docs = {}
+            for index in self._indexes.values():
+                index.clear()
+
+    def with_options(self, **kwargs):
+        """Read preference and write concern have no meaning in memory"""
+        return self
+
+    @staticmethod
+    def _public(projection):
+        # The internal insertion counter never leaves the collection
+        if not projection:
+            return {"_seq": 0}
+        if isinstance(projection, (list, tuple)) or _is_inclusion(projection):
+            return projection
+        return {**projection, "_seq": 0}
+
+
+class MemoryDatabase:
+    """Dict of MemoryCollections with pymongo Database-style access"""
+
+    def __init__(self, name="space_station"):
+        self.name = name
+        self._collections = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name):
+        with self._lock:
+            if name not in self._collections:
+                self._collections[name] = MemoryCollection(name)
+            return self._collections[name]
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    def list_collection_names(self):
+        return list(self._collections)
+
+    def drop_collection(self, name):
+        with self._lock:
+            self._collections.pop(name, None)
+
+    def command(self, name, *args, **kwargs):
+        return {"ok": 1.0}
@@ -1,18 +1,136 @@
-from pymongo import MongoClient
+import asyncio
+import threading
+from pymongo import MongoClient, ReadPreference, UpdateOne, WriteConcern
 from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
-from datetime import datetime
+from datetime import date, datetime, timezone
 import time
 
+from .config import MONGO_SETTINGS, OPERATION_CLASSES, RECONNECT_MAX_DELAY, STORAGE_BACKEND, client_options
+from .memory import MemoryDatabase
+
+MONGO_URI = MONGO_SETTINGS["uri"]
+DB_NAME = MONGO_SETTINGS["database"]
+
+READ_PREFERENCES = {
+    "primary": ReadPreference.PRIMARY,
+    "primaryPreferred": ReadPreference.PRIMARY_PREFERRED,
+    "secondary": ReadPreference.SECONDARY,
+    "secondaryPreferred": ReadPreference.SECONDARY_PREFERRED,
+    "nearest": ReadPreference.NEAREST,
+}
+
+# Connection state shared by the lazy collection handles below
+_state = {
+    "client": None,
+    "db": None,
+    "ready": False,
+    "starting": False,
+    "failures": 0,      # failed connects since the last success
+    "retryAt": None,    # perf_counter time before which get_db won't try again
+    "error": None,
+    "importedAt": time.perf_counter(),
+    "startupSeconds": None
+}
+_connect_lock = threading.Lock()
+_collections = {}  # (name, operation) -> configured Collection
+# Waste writers stamp items and then advance the version under this lock, so the
+# version is cached here instead of read back from the database every time
+_waste_lock = threading.Lock()
+_waste = {"version": None}
+
+
+class DatabaseUnavailable(Exception):
+    """Raised when the database is used before it is ready"""
+
+
+def _connect():
+    """Open a client and check the server answers"""
+    client = MongoClient(MONGO_URI, **client_options())
+    client.admin.command('ping')
+    return client
+
+
+# Statuses an item can still leave by expiring or being used up
+ACTIVE_STATUSES = ["pending", "stored"]
+
+
+def _create_indexes(database):
+    """Ensure indexes for faster queries"""
+    database["containers"].create_index("containerId", unique=True)
+    database["items"].create_index("itemId", unique=True)
+    # Waste detection: status equality first, then the expiry / usage / version range
+    database["items"].create_index([("status", 1), ("expiryAt", 1)])
+    database["items"].create_index([("status", 1), ("usageLimit", 1)])
+    database["items"].create_index([("status", 1), ("wasteVersion", 1)])
+
+
+def normalize_expiry(value):
+    """Expiry as a naive UTC datetime from a CSV string, date or datetime; None when unset.
+
+    Raises ValueError for text that is not an ISO date, rather than treating the item
+    as never expiring.
+    """
+    if value is None or str(value).strip() == "":
+        return None
+    if isinstance(value, datetime):
+        parsed = value
+    elif isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    else:
+        try:
+            parsed = datetime.fromisoformat(str(value).strip().replace("Z", "+00:00"))
+        except ValueError:
+            raise ValueError(f"Invalid expiry date '{value}', expected YYYY-MM-DD")
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _backfill_expiry(database):
+    """Give items imported before expiryAt existed their normalized expiry"""
+    items = database["items"]
+    updates = []
+    for doc in items.find({"expiryAt": {"$exists": False}, "expiryDate": {"$nin": [None, ""]}},
+                          {"_id": 0, "itemId": 1, "expiryDate": 1}):
+        try:
+            expiry = normalize_expiry(doc["expiryDate"])
+        except ValueError as e:
+            # Left without expiryAt, so it is reported again on the next start
+            print(f"⚠️ Item {doc['itemId']}: {str(e)}")
+            continue
+        updates.append(UpdateOne({"itemId": doc["itemId"]}, {"$set": {"expiryAt": expiry}}))
+    if updates:
+        items.bulk_write(updates, ordered=False)
+        print(f"🗓️ Normalized expiry dates of {len(updates)} items")
+
+
+def _prepare_database(database):
+    _create_indexes(database)
+    _backfill_expiry(database)
+
+
+def _mark_ready(client, database=None):
+    _state["client"] = client
+    _state["db"] = database if database is not None else client[DB_NAME]
+    _state["ready"] = True
+    _state.update(error=None, failures=0, retryAt=None)
+    _state["startupSeconds"] = time.perf_counter() - _state["importedAt"]
+
+
+def _retry_later(error):
+    """Record a failed connect; the next one waits 2, 4, 8... up to RECONNECT_MAX_DELAY seconds"""
+    _state["failures"] += 1
+    _state["error"] = str(error)
+    _state["retryAt"] = time.perf_counter() + min(RECONNECT_MAX_DELAY, 2 ** _state["failures"])
+
+
 # MongoDB connection with retry mechanism
 def get_mongodb_connection(max_retries=3, retry_delay=2):
     """Establish MongoDB connection with retry mechanism."""
     retries = 0
     while retries < max_retries:
         try:
-            client = MongoClient("mongodb://localhost:27017/", serverSelectionTimeoutMS=5000)
-            # Test the connection
-            client.admin.command('ismaster')
-            return client
+            return _connect()
         except (ConnectionFailure, ServerSelectionTimeoutError) as e:
             retries += 1
             if retries >= max_retries:
@@ -20,31 +138,172 @@ def get_mongodb_connection(max_retries=3, retry_delay=2):
             print(f"Connection attempt {retries} failed. Retrying in {retry_delay} seconds...")
             time.sleep(retry_delay)
 
-# Initialize database connection
-try:
-    client = get_mongodb_connection()
-    db = client["space_station"]
-    containers_collection = db["containers"]
-    items_collection = db["items"]
-    logs_collection = db["logs"]
-
-    # Ensure indexes for faster queries
-    containers_collection.create_index("containerId", unique=True)
-    items_collection.create_index("itemId", unique=True)
-    print("✅ Successfully connected to MongoDB and created indexes")
-except Exception as e:
-    print(f"🚨 Failed to initialize MongoDB: {str(e)}")
-    # Set up dummy collections for error handling
-    class DummyCollection:
-        def find(self, *args, **kwargs): return []
-        def find_one(self, *args, **kwargs): return None
-        def update_one(self, *args, **kwargs): return type('obj', (object,), {'matched_count': 0})
-        def insert_one(self, *args, **kwargs): pass
-        def create_index(self, *args, **kwargs): pass
-    
-    containers_collection = DummyCollection()
-    items_collection = DummyCollection()
-    logs_collection = DummyCollection()
+
+async def init_database(max_retries=3, retry_delay=2, warm_connections=None, reconnect=True):
+    """Connect, warm the pool and create indexes without blocking the event loop
+
+    After max_retries failed attempts the database is reported unavailable; with
+    reconnect, this keeps trying in the background (backing off like get_db) until
+    it gets through.
+    """
+    if warm_connections is None:
+        warm_connections = MONGO_SETTINGS["minPoolSize"]
+    if _state["ready"] or _state["starting"]:
+        return _state["ready"]
+    if STORAGE_BACKEND == "memory":
+        get_db()
+        return True
+    _state["starting"] = True
+    client = None
+    try:
+        for attempt in range(1, max_retries + 1):
+            try:
+                client = await asyncio.to_thread(_connect)
+                break
+            except (ConnectionFailure, ServerSelectionTimeoutError) as e:
+                _state["error"] = f"Connection attempt {attempt} failed: {str(e)}"
+                if attempt >= max_retries:
+                    print(f"🚨 Failed to initialize MongoDB after {max_retries} attempts: {str(e)}")
+                    break
+                print(f"Connection attempt {attempt} failed. Retrying in {retry_delay} seconds...")
+                await asyncio.sleep(retry_delay)
+
+        if client is not None:
+            # Open a few pooled connections up front so the first requests don't pay for them
+            await asyncio.gather(*(
+                asyncio.to_thread(client.admin.command, 'ping')
+                for _ in range(warm_connections)
+            ))
+            await asyncio.to_thread(_prepare_database, client[DB_NAME])
+            _mark_ready(client)
+            print(f"✅ Successfully connected to MongoDB and created indexes "
+                  f"({_state['startupSeconds']:.2f}s after import)")
+            return True
+    except Exception as e:
+        _state["error"] = str(e)
+        print(f"🚨 Failed to initialize MongoDB: {str(e)}")
+    finally:
+        _state["starting"] = False
+
+    _retry_later(_state["error"])
+    return await _reconnect() if reconnect else False
+
+
+async def _reconnect():
+    """Keep trying get_db in the background until the database is back"""
+    while not _state["ready"]:
+        await asyncio.sleep(max(0.0, (_state["retryAt"] or 0) - time.perf_counter()))
+        try:
+            await asyncio.to_thread(get_db)
+        except DatabaseUnavailable:
+            continue
+    print("✅ Reconnected to MongoDB")
+    return True
+
+
+def get_db():
+    """Return the database, connecting on first use if startup never ran
+
+    A failed connect is retried by the next call after a backoff delay; calls in
+    between fail fast.
+    """
+    if _state["ready"]:
+        return _state["db"]
+    if _state["starting"]:
+        raise DatabaseUnavailable("Database is still starting up")
+    if _state["retryAt"] is not None and time.perf_counter() < _state["retryAt"]:
+        raise DatabaseUnavailable(f"Database is unavailable: {_state['error']}")
+    with _connect_lock:
+        if not _state["ready"] and STORAGE_BACKEND == "memory":
+            memory_db = MemoryDatabase(DB_NAME)
+            _prepare_database(memory_db)
+            _mark_ready(None, memory_db)
+            print("✅ Using in-memory storage backend")
+        elif not _state["ready"]:
+            try:
+                client = _connect()
+                _prepare_database(client[DB_NAME])
+            except Exception as e:
+                _retry_later(e)
+                raise DatabaseUnavailable(f"Database is unavailable: {str(e)}")
+            _mark_ready(client)
+    return _state["db"]
+
+
+def _write_concern(value):
+    if value is None:
+        return None
+    return WriteConcern(w=int(value) if str(value).isdigit() else value)
+
+
+def get_collection(name, operation="default"):
+    """Return a collection configured for an operation class from db.config"""
+    key = (name, operation)
+    if key not in _collections:
+        collection = get_db()[name]
+        if operation != "default":
+            options = OPERATION_CLASSES[operation]
+            collection = collection.with_options(
+                read_preference=READ_PREFERENCES[options["readPreference"]],
+                write_concern=_write_concern(options["writeConcern"])
+            )
+        _collections[key] = collection
+    return _collections[key]
+
+
+def database_status():
+    """Readiness details for health probes"""
+    return {
+        "ready": _state["ready"],
+        "starting": _state["starting"],
+        "error": _state["error"],
+        "retryInSeconds": (None if _state["retryAt"] is None
+                           else round(max(0.0, _state["retryAt"] - time.perf_counter()), 1)),
+        "startupSeconds": _state["startupSeconds"],
+        "backend": STORAGE_BACKEND
+    }
+
+
+def close_database():
+    """Close the client; the next use reconnects lazily"""
+    if _state["client"] is not None:
+        _state["client"].close()
+    _state.update(client=None, db=None, ready=False, failures=0, retryAt=None)
+    _collections.clear()
+    _waste["version"] = None
+
+
+class LazyCollection:
+    """Collection handle that resolves against the database on first use"""
+
+    def __init__(self, name, operation="default"):
+        if operation not in OPERATION_CLASSES:
+            raise ValueError(f"Unknown operation class '{operation}'")
+        self.name = name
+        self.operation = operation
+
+    def for_operation(self, operation):
+        """Same collection routed/acknowledged per an operation class"""
+        return LazyCollection(self.name, operation)
+
+    def __getattr__(self, attr):
+        return getattr(get_collection(self.name, self.operation), attr)
+
+
+class LazyDatabase:
+    """Database handle that resolves collections lazily"""
+
+    def __getattr__(self, name):
+        return LazyCollection(name)
+
+    def __getitem__(self, name):
+        return LazyCollection(name)
+
+
+db = LazyDatabase()
+containers_collection = LazyCollection("containers")
+items_collection = LazyCollection("items")
+logs_collection = LazyCollection("logs")
 
 def get_containers():
     """Fetch all containers from the database."""
@@ -94,6 +353,27 @@ def get_items():
         print(f"🚨 Error fetching items: {str(e)}")
         return []
 
+def list_items_page(filters=None, after=None, limit=100, fields=None):
+    """Fetch one keyset page of items ordered by itemId.
+
+    Returns (items, last_item_id); last_item_id is None when there are no more pages.
+    """
+    query = dict(filters or {})
+    if after is not None:
+        query["itemId"] = {"$gt": after}
+    projection = {"_id": 0}
+    if fields:
+        projection = {field: 1 for field in fields}
+        projection.update({"_id": 0, "itemId": 1})
+
+    # Read one extra document to know whether another page follows
+    cursor = items_collection.for_operation("search").find(query, projection)
+    items = list(cursor.sort("itemId", 1).limit(limit + 1))
+    if len(items) > limit:
+        items = items[:limit]
+        return items, items[-1]["itemId"]
+    return items, None
+
 def get_item_by_id(item_id):
     """Fetch a specific item by its ID."""
     try:
@@ -118,36 +398,141 @@ def update_item(item_id, updates):
         print(f"🚨 Error updating item {item_id}: {str(e)}")
         return False
 
+def mark_waste(filter, reason):
+    """Turn every active item matching filter into waste, stamped with a new waste version.
+
+    Returns (waste version, number of items marked). Items are stamped with the version
+    after the published one, and the published version only moves there once they are
+    written. A reader that saw version N therefore finds everything wasted later with
+    wasteVersion > N. Writers hold _waste_lock, so waste must be written through this
+    process.
+    """
+    filter = {**filter, "status": {"$in": ACTIVE_STATUSES}}
+    with _waste_lock:
+        version = _next_waste_version()
+        result = items_collection.update_many(filter, {"$set": {
+            "status": "waste",
+            "wasteReason": reason,
+            "wasteVersion": version,
+            "wastedAt": datetime.utcnow()
+        }})
+        if not result.modified_count:
+            return version - 1, 0
+        _publish_waste_version(version)
+    return version, result.modified_count
+
 def mark_item_as_waste(item_id, reason="Expired"):
     """Mark an item as waste."""
     try:
-        result = update_item(item_id, {"status": "waste", "wasteReason": reason})
+        _, count = mark_waste({"itemId": item_id}, reason)
+        result = count > 0
         print(f"Marked item {item_id} as waste: {'Success' if result else 'Failed'}")
         return result
     except Exception as e:
         print(f"🚨 Error marking item {item_id} as waste: {str(e)}")
         return False
 
-def get_waste_items():
-    """Retrieve all items marked as waste."""
+def use_item(item_id, reason="Usage exhausted"):
+    """Consume one use of a stored item in a single conditional update.
+
+    The filter only matches stored items with a use left, so concurrent retrievals
+    each decrement atomically and none can take the count below zero. The same
+    update pipeline turns the item into waste when its last use is taken. Returns
+    the updated item, or None if it does not exist, is not stored or is used up.
+    """
+    exhausted = {"$lte": ["$usageLimit", 0]}
+    with _waste_lock:
+        version = _next_waste_version()
+        item = items_collection.find_one_and_update(
+            {"itemId": item_id, "status": "stored", "usageLimit": {"$gt": 0}},
+            [
+                {"$set": {"usageLimit": {"$subtract": ["$usageLimit", 1]},
+                          "lastAccessed": datetime.utcnow()}},
+                {"$set": {
+                    "status": {"$cond": [exhausted, "waste", "$status"]},
+                    "wasteReason": {"$cond": [exhausted, {"$literal": reason}, "$wasteReason"]},
+                    "wasteVersion": {"$cond": [exhausted, version, "$wasteVersion"]},
+                    "wastedAt": {"$cond": [exhausted, "$lastAccessed", "$wastedAt"]}
+                }}
+            ],
+            projection={"_id": 0, "itemId": 1, "usageLimit": 1, "status": 1,
+                        "wasteReason": 1, "wasteVersion": 1},
+            return_document=True
+        )
+        if item and item["status"] == "waste":
+            _publish_waste_version(version)
+    return item
+
+def get_waste_items(projection=None, since_version=None):
+    """Retrieve items marked as waste (only the projected fields, if given).
+
+    With since_version, only items that became waste after that waste version.
+    """
     try:
-        waste_items = list(items_collection.find({"status": "waste"}, {"_id": 0}))
+        query = {"status": "waste"}
+        if since_version is not None:
+            query["wasteVersion"] = {"$gt": since_version}
+        waste_items = list(items_collection.find(query, projection or {"_id": 0}))
         print(f"Fetched {len(waste_items)} waste items")
         return waste_items
     except Exception as e:
         print(f"🚨 Error fetching waste items: {str(e)}")
         return []
 
-def log_action(action_type, item_id, details=None):
+def get_occupancy_version():
+    """Counter bumped whenever stored item positions change; ties snapshots to db state."""
+    try:
+        doc = db.metadata_collection.find_one({"_id": "occupancy_version"})
+        return doc["value"] if doc else 0
+    except Exception as e:
+        print(f"🚨 Error reading occupancy version: {str(e)}")
+        return None
+
+def bump_occupancy_version():
+    """Increment the occupancy version after item positions change."""
+    try:
+        doc = db.metadata_collection.find_one_and_update(
+            {"_id": "occupancy_version"},
+            {"$inc": {"value": 1}},
+            upsert=True,
+            return_document=True
+        )
+        return doc["value"]
+    except Exception as e:
+        print(f"🚨 Error bumping occupancy version: {str(e)}")
+        return None
+
+def get_waste_version():
+    """Counter bumped each time items turn into waste; clients poll for changes past it."""
+    doc = db.metadata_collection.find_one({"_id": "waste_version"})
+    return doc["value"] if doc else 0
+
+def _next_waste_version():
+    """Version to stamp the next waste items with; call with _waste_lock held."""
+    if _waste["version"] is None:
+        _waste["version"] = get_waste_version()
+    return _waste["version"] + 1
+
+def _publish_waste_version(version):
+    """Advance the stored waste version once items stamped with it are written."""
+    db.metadata_collection.update_one(
+        {"_id": "waste_version"},
+        {"$max": {"value": version}},
+        upsert=True
+    )
+    _waste["version"] = version
+
+def log_action(action_type, item_id, details=None, user_id=None):
     """Log an action in the system."""
     try:
         log_entry = {
             "timestamp": datetime.utcnow().isoformat(),
             "actionType": action_type,
             "itemId": item_id,
+            "userId": user_id,
             "details": details or {}
         }
-        logs_collection.insert_one(log_entry)
+        logs_collection.for_operation("audit").insert_one(log_entry)
         print(f"Logged action: {action_type} for item {item_id}")
         return log_entry
     except Exception as e:
@@ -69,10 +69,10 @@ class CargoSystem:
     def simulate_time(self, days):
         """Time simulation with waste handling"""
         current_date = datetime.now()
-        waste = []
         
         for _ in range(days):
             current_date += timedelta(days=1)
+            waste = []
             
             # Check expirations
             for item in self.items.values():
@@ -80,6 +80,7 @@ class CargoSystem:
                     expiry_date = datetime.fromisoformat(item['expiryDate'])
                     if current_date > expiry_date:
                         waste.append(item)
+                        continue
                         
                 if item['remaining_uses'] <= 0:
                     waste.append(item)
@@ -132,6 +133,12 @@ class ContainerSpace:
         self.items[item_id] = position
         return True
     
+    def remove_item(self, item_id):
+        position = self.items.pop(item_id)
+        x, y, z, w, d, h = position
+        self.occupancy[x:x+w, y:y+d, z:z+h] = False
+        return position
+    
     def _check_collision(self, x, y, z, w, d, h):
         return np.any(self.occupancy[
             max(0, x):min(self.dims[0], x+w),
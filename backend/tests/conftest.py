@@ -0,0 +1,70 @@
+import os
+import sys
+
+# Tests run against the in-memory backend with thread workers, like offline load tests
+os.environ.setdefault("CARGO_STORAGE", "memory")
+os.environ.setdefault("CARGO_JOB_BACKEND", "thread")
+os.environ.setdefault("CARGO_SNAPSHOT_DIR", "")
+os.environ.setdefault("CARGO_COMPRESS_MIN_BYTES", "0")
+
+# The API imports its packages from backend/, as when it is started there
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+
+import time
+
+import pytest
+
+
+def item(item_id, status="pending", **fields):
+    """An item document as the import endpoint stores it"""
+    return {"itemId": item_id, "name": f"Item {item_id}", "width": 5, "depth": 5, "height": 5,
+            "mass": 1.0, "priority": 50, "preferredZone": "Lab", "usageLimit": 3,
+            "status": status, **fields}
+
+
+@pytest.fixture
+def client():
+    """API test client on a fresh in-memory database holding one 20x20x20 container"""
+    from fastapi.testclient import TestClient
+    import api
+    from db.mongodb import close_database, containers_collection
+    from utils.plan_cache import PlanCache
+
+    close_database()
+    api.plan_cache = PlanCache()
+    api._occupancy["spaces"] = None
+    containers_collection.insert_one({"containerId": "A", "zone": "Lab", "width": 20, "depth": 20, "height": 20})
+    with TestClient(api.app) as client:
+        yield client
+    close_database()
+
+
+def wait_for(client, job_id, timeout=10):
+    """Poll a placement job until it finishes (or timeout seconds pass)"""
+    deadline = time.monotonic() + timeout
+    while True:
+        job = client.get(f"/api/placement/jobs/{job_id}").json()["job"]
+        if job["status"] not in ("queued", "running") or time.monotonic() > deadline:
+            return job
+        time.sleep(0.02)
+
+
+def assert_no_overlaps(results, containers):
+    """Every placement is inside its container and no two placements share a cell"""
+    import numpy as np
+    from algorithms.bin_packing import ContainerSpace
+
+    grids = {c['containerId']: np.zeros(ContainerSpace.grid_dims(
+        c['width'], c['depth'], c['height'], c.get('resolution', 1.0)), dtype=int) for c in containers}
+    for result in results:
+        if 'container' not in result:
+            continue
+        x, y, z, w, d, h = result['position']
+        grid = grids[result['container']]
+        assert x + w <= grid.shape[0] and y + d <= grid.shape[1] and z + h <= grid.shape[2]
+        grid[x:x + w, y:y + d, z:z + h] += 1
+    for cid, grid in grids.items():
+        assert grid.max(initial=0) <= 1, f"overlapping placements in {cid}"
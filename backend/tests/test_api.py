@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta
+
+from conftest import item
+from db.mongodb import items_collection
+
+
+def test_paging_walks_every_item_once(client):
+    items_collection.insert_many([item(f"i{n:02d}") for n in range(25)])
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 10, "fields": "itemId,status"}
+        if cursor:
+            params["cursor"] = cursor
+        body = client.get("/api/items", params=params).json()
+        assert all(set(doc) == {"itemId", "status"} for doc in body["data"])
+        seen += [doc["itemId"] for doc in body["data"]]
+        cursor = body["nextCursor"]
+        if cursor is None:
+            break
+    assert seen == [f"i{n:02d}" for n in range(25)]
+
+
+def test_paging_etag_and_invalid_cursors(client):
+    items_collection.insert_one(item("a"))
+    first = client.get("/api/items")
+    again = client.get("/api/items", headers={"If-None-Match": first.headers["etag"]})
+    assert again.status_code == 304
+    for cursor in ("not-base64!", "MTIz", "WzFd"):  # garbage, 123 and [1]
+        assert client.get("/api/items", params={"cursor": cursor}).status_code == 400
+
+
+def test_retrieval_uses_up_an_item_and_wastes_it(client):
+    items_collection.insert_many([item("a", "stored", usageLimit=2), item("p"), item("w", "waste")])
+    assert client.post("/api/retrieve", json={"itemId": "a", "userId": "u1"}).json()["remainingUses"] == 1
+    assert client.post("/api/retrieve", json={"itemId": "a", "userId": "u1"}).json()["remainingUses"] == 0
+
+    doc = items_collection.find_one({"itemId": "a"})
+    assert (doc["status"], doc["wasteReason"]) == ("waste", "Usage exhausted")
+    waste = client.get("/api/waste/identify").json()
+    assert waste["wasteVersion"] == doc["wasteVersion"]
+
+    for item_id, status in (("a", 409), ("p", 409), ("w", 409), ("missing", 404)):
+        assert client.post("/api/retrieve", json={"itemId": item_id, "userId": "u1"}).status_code == status
+    assert items_collection.find_one({"itemId": "p"})["usageLimit"] == 3
+
+
+def test_waste_since_version_returns_only_new_waste(client):
+    past = datetime.utcnow() - timedelta(days=1)
+    items_collection.insert_many([item("old", "stored", expiryAt=past), item("later", "stored", usageLimit=1)])
+    assert client.post("/api/simulate/day", json={"numDays": 1, "itemsUsedPerDay": []}).status_code == 200
+    first = client.get("/api/waste/identify").json()
+    assert [doc["itemId"] for doc in first["wasteItems"]] == ["old"]
+
+    client.post("/api/simulate/day", json={"numDays": 1, "itemsUsedPerDay": ["later"]})
+    since = client.get("/api/waste/identify", params={"sinceVersion": first["wasteVersion"]}).json()
+    assert [doc["itemId"] for doc in since["wasteItems"]] == ["later"]
+    assert since["wasteVersion"] > first["wasteVersion"]
+    assert client.get("/api/waste/identify", params={"sinceVersion": since["wasteVersion"]}).json()["wasteItems"] == []
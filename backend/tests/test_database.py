@@ -0,0 +1,74 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from pymongo.errors import ServerSelectionTimeoutError
+
+from db import mongodb
+from db.memory import MemoryDatabase
+
+
+class FlakyServer:
+    """Stands in for mongodb._connect: fails `failures` times, then hands out a client"""
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ServerSelectionTimeoutError("no servers")
+        database = MemoryDatabase()
+        return SimpleNamespace(__getitem__=None, admin=SimpleNamespace(command=lambda *a: {"ok": 1}),
+                               close=lambda: None, database=database)
+
+
+@pytest.fixture
+def mongo(monkeypatch):
+    """Pretend the Mongo backend is configured, with instant backoff"""
+    mongodb.close_database()
+    monkeypatch.setattr(mongodb, "STORAGE_BACKEND", "mongo")
+    monkeypatch.setattr(mongodb, "RECONNECT_MAX_DELAY", 0.01)
+    monkeypatch.setattr(mongodb, "_mark_ready", lambda client, database=None: mongodb._state.update(
+        client=client, db=client.database, ready=True, error=None, failures=0, retryAt=None))
+    monkeypatch.setattr(mongodb, "_prepare_database", lambda database: None)
+    yield
+    mongodb.close_database()
+
+
+def test_get_db_retries_after_the_backoff(mongo, monkeypatch):
+    server = FlakyServer(failures=2)
+    monkeypatch.setattr(mongodb, "_connect", server)
+    monkeypatch.setattr(mongodb, "RECONNECT_MAX_DELAY", 60)
+    with pytest.raises(mongodb.DatabaseUnavailable):
+        mongodb.get_db()
+    # Within the backoff window calls fail fast without touching the server
+    with pytest.raises(mongodb.DatabaseUnavailable):
+        mongodb.get_db()
+    assert server.calls == 1
+    assert mongodb.database_status()["retryInSeconds"] > 0
+
+    mongodb._state["retryAt"] = 0
+    with pytest.raises(mongodb.DatabaseUnavailable):
+        mongodb.get_db()
+    assert mongodb._state["failures"] == 2
+    mongodb._state["retryAt"] = 0
+    assert isinstance(mongodb.get_db(), MemoryDatabase)
+    assert mongodb.database_status()["retryInSeconds"] is None
+
+
+def test_startup_keeps_reconnecting_in_the_background(mongo, monkeypatch):
+    server = FlakyServer(failures=5)
+    monkeypatch.setattr(mongodb, "_connect", server)
+    assert asyncio.run(mongodb.init_database(max_retries=2, retry_delay=0, warm_connections=0)) is True
+    assert server.calls == 6
+    assert mongodb.database_status()["ready"]
+
+
+def test_startup_without_reconnect_reports_unavailable(mongo, monkeypatch):
+    monkeypatch.setattr(mongodb, "_connect", FlakyServer(failures=5))
+    assert asyncio.run(mongodb.init_database(max_retries=2, retry_delay=0, reconnect=False)) is False
+    status = mongodb.database_status()
+    assert not status["ready"] and not status["starting"]
+    assert "no servers" in status["error"]
@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from utils.events import ChangeFeed, format_sse, parse_cursor
+
+
+def feed_with(n, history=10000):
+    feed = ChangeFeed(history=history)
+    for i in range(n):
+        feed.publish("item.placed", f"i{i}")
+    return feed
+
+
+def test_since_returns_missed_events():
+    feed = feed_with(5)
+    events, complete = feed.since(3)
+    assert complete
+    assert [e["seq"] for e in events] == [4, 5]
+    assert feed.since(5) == ([], True)
+    assert feed.since(3, feed.epoch)[1]
+
+
+def test_positions_the_history_cannot_cover_need_a_resync():
+    feed = feed_with(10, history=4)
+    assert feed.since(6)[1]
+    assert not feed.since(5)[1]           # fell out of the history
+    assert not feed.since(50)[1]          # ahead of the feed: handed out before a restart
+    assert not feed.since(3, "other")[1]  # another process's epoch
+    assert not ChangeFeed().since(1)[1]
+
+
+def test_subscribe_after_a_resync_keeps_new_events():
+    async def run():
+        feed = feed_with(3)
+        stream = feed.subscribe(50, feed.epoch)
+        first = await stream.__anext__()
+        feed.publish("item.wasted", "late")
+        second = await stream.__anext__()
+        await stream.aclose()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert (first["type"], first["seq"]) == ("resync", 3)
+    assert (second["type"], second["seq"]) == ("item.wasted", 4)
+
+
+def test_cursors():
+    feed = feed_with(2)
+    assert parse_cursor(feed.cursor()) == (feed.epoch, 2)
+    assert parse_cursor("7") == (None, 7)
+    with pytest.raises(ValueError):
+        parse_cursor("abc:")
+    event = feed.since(1)[0][0]
+    assert format_sse(event, feed.epoch).startswith(f"id: {feed.epoch}:2\n")
+
+
+def test_list_response_cursor_resumes_the_stream(client):
+    from api import change_feed
+
+    cursor = client.get("/api/items").headers["x-change-cursor"]
+    epoch, seq = parse_cursor(cursor)
+    assert (epoch, seq) == (change_feed.epoch, change_feed.seq)
+    change_feed.publish("item.imported", "new")
+    body = client.get("/api/changes", params={"since": seq, "epoch": epoch}).json()
+    assert not body["resync"]
+    assert [e["itemId"] for e in body["events"]] == ["new"]
+    assert client.get("/api/changes", params={"since": change_feed.seq + 50}).json()["resync"]
+    assert client.get("/api/changes/stream", params={"since": "bad"}).status_code == 400
@@ -0,0 +1,110 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+from pymongo import InsertOne, UpdateOne
+
+from db.memory import DuplicateKeyError, MemoryCollection
+
+
+@pytest.fixture
+def items():
+    collection = MemoryCollection("items")
+    collection.create_index("itemId", unique=True)
+    collection.insert_many([
+        {"itemId": "a", "name": "Food", "status": "stored", "usageLimit": 2, "position": {"x": 1, "y": 2}},
+        {"itemId": "b", "name": "Food", "status": "pending", "usageLimit": 0},
+        {"itemId": "c", "name": "Tool", "status": "waste", "usageLimit": 5},
+    ])
+    return collection
+
+
+def test_inclusion_projections(items):
+    doc = items.find_one({"itemId": "a"}, {"_id": 1})
+    assert set(doc) == {"_id"}
+    assert items.find_one({"itemId": "a"}, {"_id": 0, "itemId": 1, "position.y": 1}) == {
+        "itemId": "a", "position": {"y": 2}}
+    assert set(items.find_one({"itemId": "a"}, {"name": 1})) == {"_id", "name"}
+
+
+def test_exclusion_projections(items):
+    doc = items.find_one({"itemId": "a"}, {"_id": 0, "position": 0})
+    assert doc == {"itemId": "a", "name": "Food", "status": "stored", "usageLimit": 2}
+    with pytest.raises(ValueError):
+        items.find_one({"itemId": "a"}, {"name": 1, "status": 0})
+
+
+def test_queries_updates_and_sorting(items):
+    assert [d["itemId"] for d in items.find({"usageLimit": {"$gt": 0}}).sort("usageLimit", -1)] == ["c", "a"]
+    assert items.count_documents({"status": {"$in": ["stored", "pending"]}, "name": "Food"}) == 2
+    assert items.update_many({"name": "Food"}, {"$inc": {"usageLimit": 1}}).modified_count == 2
+    assert items.find_one({"itemId": "b"})["usageLimit"] == 1
+    updated = items.find_one_and_update({"itemId": "a"}, {"$set": {"status": "waste"}},
+                                        projection={"_id": 0, "status": 1}, return_document=True)
+    assert updated == {"status": "waste"}
+
+
+def test_unique_index_is_enforced(items):
+    with pytest.raises(DuplicateKeyError):
+        items.insert_one({"itemId": "a"})
+    with pytest.raises(DuplicateKeyError):
+        items.update_one({"itemId": "b"}, {"$set": {"itemId": "a"}})
+    assert items.find_one({"itemId": "b"}) is not None
+
+
+def test_bulk_write(items):
+    result = items.bulk_write([
+        UpdateOne({"itemId": "a"}, {"$set": {"status": "waste"}}),
+        UpdateOne({"itemId": "missing"}, {"$set": {"status": "waste"}}),
+        InsertOne({"itemId": "a"}),
+        InsertOne({"itemId": "d"}),
+    ], ordered=False)
+    assert (result.matched_count, result.modified_count, result.inserted_count) == (1, 1, 1)
+    assert items.find_one({"itemId": "d"}) is not None
+
+
+def test_update_pipeline_with_cond(items):
+    exhausted = {"$lte": ["$usageLimit", 0]}
+    pipeline = [
+        {"$set": {"usageLimit": {"$subtract": ["$usageLimit", 1]}}},
+        {"$set": {"status": {"$cond": [exhausted, "waste", "$status"]},
+                  "wasteReason": {"$cond": [exhausted, {"$literal": "$used"}, "$wasteReason"]}}},
+    ]
+    assert items.find_one_and_update({"itemId": "a"}, pipeline, return_document=True)["status"] == "stored"
+    doc = items.find_one_and_update({"itemId": "a"}, pipeline, projection={"_id": 0}, return_document=True)
+    assert doc["usageLimit"] == 0
+    assert (doc["status"], doc["wasteReason"]) == ("waste", "$used")
+
+
+def test_compound_indexes_match_a_full_scan():
+    rng = random.Random(7)
+    indexed, plain = MemoryCollection("indexed"), MemoryCollection("plain")
+    indexed.create_index([("status", 1), ("expiryAt", 1)])
+    indexed.create_index([("status", 1), ("usageLimit", 1)])
+    start = datetime(2025, 1, 1)
+    for n in range(500):
+        doc = {"itemId": n, "status": rng.choice(["pending", "stored", "waste"]),
+               "usageLimit": rng.choice([0, 1, 2, 2.5, None])}
+        if rng.random() < 0.8:
+            doc["expiryAt"] = start + timedelta(days=rng.randint(0, 50))
+        indexed.insert_one(dict(doc))
+        plain.insert_one(dict(doc))
+
+    assert indexed.index_information()["status_1_expiryAt_1"]["key"] == [("status", 1), ("expiryAt", 1)]
+    # Equality on status plus a range on the second key narrows to exactly the matches
+    query = {"status": {"$in": ["pending", "stored"]}, "usageLimit": {"$lte": 0}}
+    assert len(indexed._candidate_ids(query)) == plain.count_documents(query)
+
+    for _ in range(200):
+        query = {"status": rng.choice(["stored", {"$in": ["pending", "stored"]}, {"$ne": "waste"}])}
+        field = rng.choice(["expiryAt", "usageLimit"])
+        if field == "expiryAt":
+            query[field] = {rng.choice(["$lt", "$lte", "$gt", "$gte"]): start + timedelta(days=rng.randint(-5, 55))}
+        else:
+            query[field] = rng.choice([{"$lte": 0}, {"$gt": 0, "$lt": 2.5}, 2, None])
+        expected = sorted(d["itemId"] for d in plain.find(query))
+        assert sorted(d["itemId"] for d in indexed.find(query)) == expected
+        # Index keys follow updates
+        changed = rng.randrange(500)
+        for collection in (indexed, plain):
+            collection.update_one({"itemId": changed}, {"$set": {"status": "stored", "usageLimit": 0}})
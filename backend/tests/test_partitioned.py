@@ -0,0 +1,55 @@
+from algorithms import PriorityBinPacker, ZonePartitionedPacker, run_placement_job
+from benchmarks.generator import generate_manifest
+from conftest import assert_no_overlaps, item, wait_for
+
+OPTIONS = {'rearrangement_time_budget': 0}
+
+
+def outcome(results):
+    return [(r['item']['itemId'], r.get('container'), r.get('position')) for r in results]
+
+
+def test_parallel_zones_match_packing_the_zones_in_process():
+    manifest = generate_manifest(300, seed=3)
+    in_process = ZonePartitionedPacker(manifest['containers'], max_workers=1, **OPTIONS)
+    parallel = ZonePartitionedPacker(manifest['containers'], max_workers=2, **OPTIONS)
+    expected = in_process.pack_items(manifest['items'])
+    assert outcome(parallel.pack_items(manifest['items'])) == outcome(expected)
+    assert_no_overlaps(expected, manifest['containers'])
+
+    zones = {c['containerId']: c['zone'] for c in manifest['containers']}
+    placed = [r for r in expected if 'container' in r]
+    assert len(placed) == len(manifest['items'])
+    # Only items spilled out of a full zone land elsewhere
+    assert sum(zones[r['container']] != r['item']['preferredZone'] for r in placed) <= 1
+
+
+def test_one_zone_packs_like_the_serial_packer():
+    manifest = generate_manifest(120, seed=5)
+    containers = [dict(c, zone='Lab') for c in manifest['containers']]
+    items = [dict(i, preferredZone='Lab') for i in manifest['items']]
+    serial = list(PriorityBinPacker(containers, **OPTIONS).pack_items(items))
+    partitioned = ZonePartitionedPacker(containers, max_workers=2, **OPTIONS).pack_items(items)
+    assert outcome(partitioned) == outcome(serial)
+
+
+def test_placement_job_honours_the_workers_option():
+    manifest = generate_manifest(200, seed=4)
+    containers, items = manifest['containers'], manifest['items']
+    serial = run_placement_job(containers, items, options=OPTIONS)
+    partitioned = run_placement_job(containers, items, options={**OPTIONS, 'workers': 2})
+    expected = ZonePartitionedPacker(containers, max_workers=1, **OPTIONS).pack_items(items)
+    assert [(p['itemId'], p['containerId']) for p in partitioned['placements']] == [
+        (r['item']['itemId'], r['container']) for r in expected if 'container' in r]
+    assert len(partitioned['placements']) == len(serial['placements'])
+    assert partitioned['placements'] != serial['placements']
+
+
+def test_placement_endpoint_takes_workers(client):
+    from db.mongodb import containers_collection, items_collection
+    containers_collection.insert_one({"containerId": "B", "zone": "Crew", "width": 20, "depth": 20, "height": 20})
+    items_collection.insert_many([item("a"), item("b", preferredZone="Crew")])
+    job = wait_for(client, client.post("/api/placement", params={"workers": 2}).json()["job"]["jobId"])
+    assert job["status"] == "completed"
+    assert {(p["itemId"], p["containerId"]) for p in job["result"]["placements"]} == {("a", "A"), ("b", "B")}
+    assert client.post("/api/placement", params={"workers": -1}).status_code == 422
@@ -0,0 +1,82 @@
+import asyncio
+import time
+
+import api
+from conftest import item, wait_for
+from db.mongodb import bump_occupancy_version, items_collection
+from utils.jobs import JobManager, ProcessJobBackend
+
+
+def test_placement_job_stores_items_and_cache_hits_are_immediate(client):
+    items_collection.insert_many([item("a"), item("b")])
+    response = client.post("/api/placement", params={"dryRun": True})
+    assert response.status_code == 202
+    job = wait_for(client, response.json()["job"]["jobId"])
+    assert job["status"] == "completed"
+    assert items_collection.count_documents({"status": "pending"}) == 2
+
+    # The dry run cached the plan, so storing it needs no new job
+    cached = client.post("/api/placement")
+    assert cached.status_code == 200
+    assert (cached.json()["job"]["cached"], cached.json()["job"]["stored"]) == (True, 2)
+    assert items_collection.count_documents({"status": "stored", "containerId": "A"}) == 2
+
+    items_collection.insert_one(item("c"))
+    job = wait_for(client, client.post("/api/placement").json()["job"]["jobId"])
+    assert (job["status"], job["stored"]) == ("completed", 1)
+    assert client.post("/api/placement").status_code == 400  # nothing pending
+
+
+def test_stale_plans_store_nothing(client):
+    items_collection.insert_one(item("a"))
+    job = wait_for(client, client.post("/api/placement", params={"dryRun": True}).json()["job"]["jobId"])
+    bump_occupancy_version()
+    outcome = api._commit_placement(job, job["result"])
+    assert (outcome["status"], outcome["stored"]) == ("stale", 0)
+    assert items_collection.find_one({"itemId": "a"})["status"] == "pending"
+
+
+def test_cancel(client):
+    assert client.delete("/api/placement/jobs/unknown").status_code == 404
+    items_collection.insert_one(item("a"))
+    job = wait_for(client, client.post("/api/placement", params={"dryRun": True}).json()["job"]["jobId"])
+    # A finished job keeps its outcome
+    assert client.delete(f"/api/placement/jobs/{job['jobId']}").json()["job"]["status"] == "completed"
+
+
+def wait_for_cancel(progress=None, cancel=None):
+    """Job that runs until it is cancelled, talking to the manager all the while"""
+    while not cancel.is_set():
+        progress.put_nowait({"status": "running"})
+        time.sleep(0.01)
+    return {"status": "cancelled"}
+
+
+def test_process_workers_stop_before_the_manager():
+    async def run():
+        manager = JobManager(backend=ProcessJobBackend(max_workers=1))
+        job = manager.submit("test", wait_for_cancel)
+        while manager.get(job["jobId"])["status"] == "queued":
+            await asyncio.sleep(0.02)
+        future = manager.jobs[job["jobId"]]["_future"]
+        started = time.monotonic()
+        manager.shutdown()
+        return future.result(timeout=0), time.monotonic() - started
+
+    result, took = asyncio.run(run())
+    assert result == {"status": "cancelled"}
+    assert took < 5
+
+
+def test_profiled_placement_profiles_the_job(client, monkeypatch, tmp_path):
+    monkeypatch.setattr("utils.profiling.ADMIN_TOKEN", "secret")
+    monkeypatch.setattr("utils.profiling.PROFILE_DIR", str(tmp_path))
+    items_collection.insert_one(item("a"))
+    headers = {"X-Profile": "cprofile", "X-Admin-Token": "secret"}
+    response = client.post("/api/placement", params={"dryRun": True}, headers=headers)
+    job = wait_for(client, response.json()["job"]["jobId"])
+    assert job["status"] == "completed"
+    assert job["profileId"] != response.headers["x-profile-id"]
+    profile = client.get(f"/api/admin/profiles/{job['profileId']}", headers=headers)
+    assert profile.text.startswith("placement job [cprofile]")
+    assert "run_placement_job" in profile.text
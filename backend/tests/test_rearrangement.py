@@ -0,0 +1,52 @@
+import time
+
+from algorithms import PriorityBinPacker
+from benchmarks.generator import generate_items
+
+# A is a 1 x 2 x 4 column holding two 1 x 2 x 2 items; B has room for both of them
+CONTAINERS = [
+    {'containerId': 'A', 'zone': 'Lab', 'width': 1, 'depth': 2, 'height': 4},
+    {'containerId': 'B', 'zone': 'Crew', 'width': 2, 'depth': 2, 'height': 2},
+]
+
+
+def full_column():
+    packer = PriorityBinPacker(CONTAINERS)
+    space = packer.containers['A']['space']
+    space.add_item('s1', (0, 0, 0, 1, 2, 2))
+    space.add_item('s2', (0, 0, 2, 1, 2, 2))
+    return packer
+
+
+def incoming(width=1, depth=2, height=4):
+    return {'itemId': 'new', 'width': width, 'depth': depth, 'height': height, 'mass': 0,
+            'priority': 50, 'preferredZone': 'Lab'}
+
+
+def test_moves_make_room_and_leave_the_spaces_untouched():
+    packer = full_column()
+    before = {cid: c['space'].occupancy.copy() for cid, c in packer.containers.items()}
+    [result] = packer.pack_items([incoming()])
+    assert (result['targetContainer'], result['targetPosition']) == ('A', (0, 0, 0, 1, 2, 4))
+    assert sorted(m['itemId'] for m in result['rearrangements']) == ['s1', 's2']
+    for move in result['rearrangements']:
+        assert move['toContainer'] == 'B'
+        # Moved items get the same single orientation incoming items do
+        assert move['newPosition'][3:] == PriorityBinPacker.get_orientations(
+            dict(zip(('width', 'depth', 'height'), move['fromPosition'][3:])))[0]
+    for cid, grid in before.items():
+        assert (packer.containers[cid]['space'].occupancy == grid).all()
+
+
+def test_one_budget_bounds_rearrangements_for_the_whole_pack():
+    items = generate_items(300, zones=['Lab'], seed=0)
+    containers = [{'containerId': f'c{i}', 'zone': 'Lab', 'width': 20, 'depth': 20, 'height': 20}
+                  for i in range(3)]
+    started = time.perf_counter()
+    packer = PriorityBinPacker(containers, rearrangement_time_budget=0.5, rearrangement_total_budget=0.5)
+    results = list(packer.pack_items(items))
+    unplaced = [r for r in results if 'container' not in r]
+    assert len(unplaced) > 10
+    # Without the total budget each unplaced item could take half a second
+    assert time.perf_counter() - started < 0.5 + 0.05 * len(unplaced)
+    assert all(r['rearrangements'] == [] and r['targetContainer'] is None for r in unplaced[-3:])
@@ -0,0 +1,51 @@
+from algorithms import PriorityBinPacker, run_placement_job
+from algorithms.placement_job import position_document
+from conftest import assert_no_overlaps
+
+# Two-unit cells: A is a 1 x 2 x 4 grid, B a 2 x 2 x 2 grid
+CONTAINERS = [
+    {'containerId': 'A', 'zone': 'Lab', 'width': 2, 'depth': 4, 'height': 8, 'resolution': 2},
+    {'containerId': 'B', 'zone': 'Crew', 'width': 4, 'depth': 4, 'height': 4, 'resolution': 2},
+]
+
+
+def stored(item_id, container_id, position):
+    return {'itemId': item_id, 'containerId': container_id, 'position': position_document(position), 'mass': 1}
+
+
+def manifest_item(item_id, width, depth, height, zone='Lab'):
+    return {'itemId': item_id, 'width': width, 'depth': depth, 'height': height, 'mass': 1,
+            'priority': 50, 'preferredZone': zone}
+
+
+def test_placements_come_back_in_container_units():
+    items = [manifest_item(f'i{n}', 3, 1, 2, zone='Crew') for n in range(2)]
+    packer = PriorityBinPacker(CONTAINERS, rearrangement_time_budget=0)
+    results = list(packer.pack_items(items))
+    assert_no_overlaps(results, CONTAINERS)
+
+    job = run_placement_job(CONTAINERS, items, options={'rearrangement_time_budget': 0})
+    assert len(job['placements']) == 2
+    for placement in job['placements']:
+        start = placement['position']['startCoordinates']
+        end = placement['position']['endCoordinates']
+        # 3 x 1 x 2 units round up to 2 x 1 x 1 cells, i.e. 4 x 2 x 2 units in some orientation
+        assert sorted(end[k] - start[k] for k in start) == [2.0, 2.0, 4.0]
+        assert all(v % 2 == 0 for v in (*start.values(), *end.values()))
+
+
+def test_rearrangements_come_back_in_container_units():
+    stored_items = [stored('s1', 'A', (0, 0, 0, 2, 4, 4)), stored('s2', 'A', (0, 0, 4, 2, 4, 4))]
+    job = run_placement_job(CONTAINERS, [manifest_item('new', 2, 4, 8)], stored_items)
+    [unplaced] = job['unplaced']
+    assert unplaced['targetContainer'] == 'A'
+    assert unplaced['targetPosition'] == position_document((0, 0, 0, 2, 4, 8))
+
+    moves = {move['itemId']: move for move in unplaced['rearrangements']}
+    assert moves['s1']['fromPosition'] == position_document((0, 0, 0, 2, 4, 4))
+    assert moves['s2']['fromPosition'] == position_document((0, 0, 4, 2, 4, 4))
+    for move in moves.values():
+        assert move['toContainer'] == 'B'
+        start, end = move['newPosition']['startCoordinates'], move['newPosition']['endCoordinates']
+        assert sorted(end[k] - start[k] for k in start) == [2.0, 4.0, 4.0]
+        assert all(0 <= start[k] < end[k] <= 4 for k in start)
@@ -0,0 +1,132 @@
+import numpy as np
+import pytest
+
+from algorithms.bin_packing import ContainerSpace
+from algorithms.placement_job import position_document, run_placement_job
+from algorithms.snapshots import load_snapshot, restore_spaces, save_snapshot
+
+CONTAINERS = [
+    {'containerId': 'A', 'zone': 'Lab', 'width': 20, 'depth': 30, 'height': 10, 'maxWeight': 500},
+    {'containerId': 'B', 'zone': 'Crew', 'width': 10, 'depth': 10, 'height': 10},
+]
+
+
+def stored(item_id, container_id, position, mass=1.0):
+    return {'itemId': item_id, 'containerId': container_id,
+            'position': position_document(position), 'mass': mass}
+
+
+STORED = [
+    stored('i1', 'A', (0, 0, 0, 5, 5, 5), 2.0),
+    stored('i2', 'A', (5, 0, 0, 5, 5, 5)),
+    stored('i3', 'B', (0, 0, 0, 10, 2, 3), 4.0),
+]
+
+
+def rebuilt(stored_items):
+    spaces, info = restore_spaces(CONTAINERS, stored_items)
+    assert info['snapshot'] is False
+    return spaces
+
+
+def test_round_trip_maps_grids_back_without_replay(tmp_path):
+    spaces = rebuilt(STORED)
+    save_snapshot(spaces, tmp_path, db_version=[3, 1])
+
+    loaded, index = load_snapshot(tmp_path, verify=True)
+    assert index['dbVersion'] == [3, 1]
+    for cid, space in spaces.items():
+        assert isinstance(loaded[cid].occupancy, np.memmap)
+        assert np.array_equal(loaded[cid].occupancy, space.occupancy)
+        assert loaded[cid].items == space.items
+        assert loaded[cid].masses == space.masses
+        assert loaded[cid].center_of_mass() == space.center_of_mass()
+
+    restored, info = restore_spaces(CONTAINERS, STORED, directory=tmp_path, db_version=[3, 1])
+    assert info == {'snapshot': True, 'replayed': None, 'dbVersion': [3, 1]}
+    assert restored['A'].items == spaces['A'].items
+
+
+def test_stale_db_version_replays_the_delta(tmp_path):
+    save_snapshot(rebuilt(STORED), tmp_path, db_version=[3, 1])
+    current = [
+        stored('i1', 'A', (0, 10, 0, 5, 5, 5), 2.0),  # moved
+        stored('i3', 'B', (0, 0, 0, 10, 2, 3), 4.0),  # unchanged; i2 was removed
+        stored('i4', 'B', (0, 5, 0, 2, 2, 2)),        # added
+    ]
+
+    restored, info = restore_spaces(CONTAINERS, current, directory=tmp_path, db_version=[4, 1])
+    assert info['snapshot'] is True
+    assert info['replayed'] == {'added': 1, 'removed': 1, 'moved': 1, 'failed': 0}
+    expected = rebuilt(current)
+    for cid in expected:
+        assert np.array_equal(restored[cid].occupancy, expected[cid].occupancy)
+        assert restored[cid].items == expected[cid].items
+    # Copy-on-write: replaying never touches the files
+    on_disk, _ = load_snapshot(tmp_path, verify=True)
+    assert 'i2' in on_disk['A'].items
+
+
+def test_snapshot_for_other_container_sizes_is_ignored(tmp_path):
+    save_snapshot(rebuilt(STORED), tmp_path, db_version=[3, 1])
+    resized = [dict(CONTAINERS[0], depth=40), CONTAINERS[1]]
+    spaces, info = restore_spaces(resized, STORED, directory=tmp_path, db_version=[3, 1])
+    assert info['snapshot'] is False
+    assert spaces['A'].dims == (20, 40, 10)
+
+
+def test_tampered_index_is_rejected(tmp_path):
+    import json
+    save_snapshot(rebuilt(STORED), tmp_path, db_version=[3, 1])
+    index_path = tmp_path / 'index.json'
+    index = json.loads(index_path.read_text())
+    index['containers']['A']['items']['i1'] = [1, 1, 1, 1, 1, 1]
+    index_path.write_text(json.dumps(index))
+    assert load_snapshot(tmp_path) == (None, None)
+
+
+def test_crash_before_the_index_swap_keeps_the_previous_snapshot(tmp_path, monkeypatch):
+    save_snapshot(rebuilt(STORED), tmp_path, db_version=[3, 1])
+
+    def crash(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr('algorithms.snapshots.os.replace', crash)
+    with pytest.raises(OSError):
+        save_snapshot(rebuilt(STORED[:1]), tmp_path, db_version=[4, 1])
+    monkeypatch.undo()
+
+    loaded, index = load_snapshot(tmp_path, verify=True)
+    assert index['dbVersion'] == [3, 1]
+    assert set(loaded['A'].items) == {'i1', 'i2'}
+    # The next save cleans up the grids the crashed one left behind
+    index = save_snapshot(rebuilt(STORED), tmp_path, db_version=[5, 1])
+    grids = sorted(p.name for p in tmp_path.glob('*.npy'))
+    assert grids == sorted(entry['file'] for entry in index['containers'].values())
+
+
+def test_grid_that_disagrees_with_the_items_is_rebuilt(tmp_path):
+    index = save_snapshot(rebuilt(STORED), tmp_path, db_version=[3, 1])
+    # Cells taken by no indexed item, where the next item is replayed
+    grid_path = tmp_path / index['containers']['B']['file']
+    grid = np.load(grid_path)
+    grid[0:2, 5:7, 0:2] = True
+    np.save(grid_path, grid)
+
+    current = STORED + [stored('i4', 'B', (0, 5, 0, 2, 2, 2))]
+    spaces, info = restore_spaces(CONTAINERS, current, directory=tmp_path, db_version=[4, 1])
+    assert info['snapshot'] is False
+    assert info['replayed']['failed'] == 0
+    assert np.array_equal(spaces['B'].occupancy, rebuilt(current)['B'].occupancy)
+
+
+def test_placement_job_starts_from_the_snapshot(tmp_path):
+    save_snapshot(rebuilt(STORED), tmp_path, db_version=[3, 1])
+    items = [{'itemId': 'new', 'width': 5, 'depth': 5, 'height': 5, 'mass': 1,
+              'priority': 50, 'preferredZone': 'Lab'}]
+    result = run_placement_job(CONTAINERS, items, STORED, {}, snapshot_dir=str(tmp_path), db_version=[3, 1])
+    assert result['snapshot']['snapshot'] is True
+    [placement] = result['placements']
+    # i1 already fills the front-left corner, so the new item goes on top of it
+    assert placement['containerId'] == 'A'
+    assert placement['position']['startCoordinates'] == {'width': 0.0, 'depth': 0.0, 'height': 5.0}
@@ -0,0 +1,117 @@
+import asyncio
+import json
+import uuid
+from collections import deque
+from datetime import datetime
+
+HEARTBEAT_SECONDS = 15
+
+
+class ChangeFeed:
+    """In-process feed of item/container change events with resumable sequence numbers
+
+    Events are kept in a bounded history so a client that reconnects with its last
+    seen sequence number gets exactly the events it missed. Sequence numbers are per
+    process, so cursors carry the process epoch too; a client whose position fell out
+    of the history, or came from another process, is told to resync.
+    Publish from the event loop thread.
+    """
+
+    def __init__(self, history=10000, queue_size=1000):
+        self.epoch = uuid.uuid4().hex[:8]
+        self.seq = 0
+        self.history = deque(maxlen=history)
+        self.queue_size = queue_size
+        self._subscribers = set()
+
+    def publish(self, event_type, item_id=None, **data):
+        self.seq += 1
+        event = {
+            "seq": self.seq,
+            "type": event_type,
+            "timestamp": datetime.utcnow().isoformat(),
+            "itemId": item_id,
+            "data": data
+        }
+        self.history.append(event)
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # A stalled client is dropped; it resumes from its last id on reconnect
+                self._subscribers.discard(queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+        return event
+
+    def cursor(self, seq=None):
+        """Resume position "epoch:seq" for seq (default: the latest event)"""
+        return f"{self.epoch}:{self.seq if seq is None else seq}"
+
+    def since(self, seq, epoch=None):
+        """Events after seq, and whether the history still covers that position
+
+        A position ahead of the feed, or from another epoch, was handed out by an
+        earlier process and is never complete.
+        """
+        oldest = self.history[0]["seq"] if self.history else self.seq + 1
+        complete = epoch in (None, self.epoch) and oldest - 1 <= seq <= self.seq
+        return [e for e in self.history if e["seq"] > seq], complete
+
+    async def subscribe(self, last_seq=None, epoch=None):
+        """Yield missed events after last_seq, then live events as they are published"""
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        try:
+            if last_seq is not None:
+                backlog, complete = self.since(last_seq, epoch)
+                if not complete:
+                    # Live events from here on; the client reloads everything before it
+                    last_seq, backlog = self.seq, []
+                    yield {"seq": last_seq, "type": "resync", "itemId": None, "data": {}}
+                for event in backlog:
+                    yield event
+                last_seq = backlog[-1]["seq"] if backlog else last_seq
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield None  # heartbeat
+                    continue
+                if event is None:
+                    return
+                if last_seq is not None and event["seq"] <= last_seq:
+                    continue
+                yield event
+        finally:
+            self._subscribers.discard(queue)
+
+    @property
+    def subscriber_count(self):
+        return len(self._subscribers)
+
+
+def parse_cursor(value):
+    """(epoch, seq) from an "epoch:seq" cursor or a bare sequence number
+
+    The epoch is None for a bare number; raises ValueError for anything else.
+    """
+    epoch, _, seq = value.rpartition(":")
+    if not seq.isdigit():
+        raise ValueError(f"Invalid change cursor '{value}'")
+    return epoch or None, int(seq)
+
+
+def format_sse(event, epoch=None):
+    """Encode an event (or a heartbeat for None) as a Server-Sent Events frame
+
+    With epoch, the event id is a cursor the client resumes from via Last-Event-ID.
+    """
+    if event is None:
+        return ": keep-alive\n\n"
+    event_id = f"{epoch}:{event['seq']}" if epoch else event['seq']
+    return f"id: {event_id}\nevent: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+change_feed = ChangeFeed()
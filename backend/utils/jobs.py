@@ -0,0 +1,235 @@
+import asyncio
+import inspect
+import os
+import queue
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+
+# "process" runs jobs in a local process pool, "thread" in a thread pool (no pickling,
+# handy for tests and the memory storage backend)
+JOB_BACKEND = os.environ.get("CARGO_JOB_BACKEND", "process").lower()
+JOB_WORKERS = int(os.environ.get("CARGO_JOB_WORKERS", "2"))
+POLL_SECONDS = 0.2
+KEEP_FINISHED = 200
+
+FINISHED = ("completed", "failed", "cancelled", "stale")
+
+
+class ThreadJobBackend:
+    """Runs jobs on a thread pool; progress and cancel use plain queue/threading objects"""
+
+    def __init__(self, max_workers=JOB_WORKERS):
+        self.max_workers = max_workers
+        self._pool = None
+
+    def submit(self, fn, *args, **kwargs):
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="job")
+        return self._pool.submit(fn, *args, **kwargs)
+
+    def channel(self):
+        """(progress queue, cancel event) that the worker can use"""
+        return queue.Queue(), threading.Event()
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+class ProcessJobBackend(ThreadJobBackend):
+    """Runs jobs in a local process pool; progress and cancel go through a Manager"""
+
+    def __init__(self, max_workers=JOB_WORKERS):
+        super().__init__(max_workers)
+        self._manager = None
+
+    def submit(self, fn, *args, **kwargs):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._pool.submit(fn, *args, **kwargs)
+
+    def channel(self):
+        if self._manager is None:
+            import multiprocessing
+            self._manager = multiprocessing.Manager()
+        return self._manager.Queue(), self._manager.Event()
+
+    def shutdown(self):
+        # Running workers still talk to the manager, so they must return before it stops
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+
+
+BACKENDS = {"process": ProcessJobBackend, "thread": ThreadJobBackend}
+
+
+class JobManager:
+    """Tracks background jobs: submit returns an id, then poll, cancel or watch events
+
+    The worker function is called as fn(*args, progress=queue, cancel=event) and
+    should put progress dicts on the queue and stop early once the event is set.
+    Every progress update is also published to the change feed as "job.progress".
+    Methods must be called from the event loop thread.
+    """
+
+    def __init__(self, backend=None, feed=None):
+        self.backend = backend
+        self.feed = feed
+        self.jobs = OrderedDict()
+        self._tasks = set()
+
+    def _backend(self):
+        if self.backend is None:
+            self.backend = BACKENDS.get(JOB_BACKEND, ProcessJobBackend)()
+        return self.backend
+
+    def submit(self, job_type, fn, *args, on_complete=None, **meta):
+        """Queue fn in the worker pool and return the job record immediately
+
+        on_complete(job, result) runs on the event loop when the worker returns a
+        completed result, and may be a coroutine function. It may return the status to
+        record (e.g. "stale"), or a dict with that "status", an "error" saying why and
+        any other fields to add to the job.
+        """
+        progress, cancel = self._backend().channel()
+        job = {
+            "jobId": uuid.uuid4().hex,
+            "type": job_type,
+            "status": "queued",
+            "progress": {},
+            "submittedAt": datetime.utcnow().isoformat(),
+            "startedAt": None,
+            "finishedAt": None,
+            "result": None,
+            "error": None,
+            **meta,
+            "_cancel": cancel
+        }
+        self.jobs[job["jobId"]] = job
+        self._trim()
+        future = self.backend.submit(fn, *args, progress=progress, cancel=cancel)
+        job["_future"] = future
+        task = asyncio.create_task(self._watch(job, future, progress, cancel, on_complete))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return self.public(job)
+
+    def record(self, job_type, result, status="completed", **meta):
+        """Store a job that finished without running (e.g. answered from a cache)"""
+        now = datetime.utcnow().isoformat()
+        job = {
+            "jobId": uuid.uuid4().hex,
+            "type": job_type,
+            "status": status,
+            "progress": {},
+            "submittedAt": now,
+            "startedAt": now,
+            "finishedAt": now,
+            "result": result,
+            "error": None,
+            **meta
+        }
+        self.jobs[job["jobId"]] = job
+        self._trim()
+        return self.public(job)
+
+    def get(self, job_id):
+        job = self.jobs.get(job_id)
+        return self.public(job) if job else None
+
+    def cancel(self, job_id):
+        """Ask a job to stop; returns the job record, or None if it is unknown"""
+        job = self.jobs.get(job_id)
+        if job is None:
+            return None
+        if job["status"] not in FINISHED:
+            job["_cancel"].set()
+            if job["_future"].cancel():  # never started
+                self._finish(job, "cancelled")
+            else:
+                job["status"] = "cancelling"
+        return self.public(job)
+
+    @staticmethod
+    def public(job):
+        return {k: v for k, v in job.items() if not k.startswith("_")}
+
+    def _publish(self, job):
+        if self.feed is not None:
+            self.feed.publish("job.progress", None, jobId=job["jobId"], jobType=job["type"],
+                              status=job["status"], progress=job["progress"])
+
+    def _drain(self, job, progress):
+        updated = False
+        while True:
+            try:
+                update = progress.get_nowait()
+            except (queue.Empty, EOFError, OSError):
+                break
+            job["progress"] = update
+            updated = True
+        if updated:
+            if job["status"] == "queued":
+                job["status"] = "running"
+                job["startedAt"] = datetime.utcnow().isoformat()
+            self._publish(job)
+
+    def _finish(self, job, status, result=None, error=None, **fields):
+        if job["status"] in FINISHED:
+            return
+        job.update(fields)
+        job.update(status=status, result=result, error=error, finishedAt=datetime.utcnow().isoformat())
+        self._publish(job)
+
+    async def _watch(self, job, future, progress, cancel, on_complete):
+        wrapped = asyncio.wrap_future(future)
+        while not wrapped.done():
+            await asyncio.wait({wrapped}, timeout=POLL_SECONDS)
+            self._drain(job, progress)
+        self._drain(job, progress)
+        if wrapped.cancelled():
+            self._finish(job, "cancelled")
+            return
+        try:
+            result = wrapped.result()
+        except Exception as e:
+            print(f"❌ Job {job['jobId']} failed: {e}")
+            self._finish(job, "failed", error=str(e))
+            return
+        if result.get("status") == "cancelled":
+            self._finish(job, "cancelled")
+            return
+        outcome = None
+        try:
+            if on_complete is not None:
+                outcome = on_complete(job, result)
+                if inspect.isawaitable(outcome):
+                    outcome = await outcome
+        except Exception as e:
+            print(f"❌ Job {job['jobId']} could not be committed: {e}")
+            self._finish(job, "failed", result=result, error=str(e))
+            return
+        fields = dict(outcome) if isinstance(outcome, dict) else {"status": outcome}
+        self._finish(job, fields.pop("status", None) or "completed", result=result, **fields)
+
+    def _trim(self):
+        """Forget the oldest finished jobs once more than KEEP_FINISHED are held"""
+        finished = [jid for jid, job in self.jobs.items() if job["status"] in FINISHED]
+        for job_id in finished[:max(0, len(finished) - KEEP_FINISHED)]:
+            del self.jobs[job_id]
+
+    def shutdown(self):
+        """Ask unfinished jobs to stop, then shut the worker pool down"""
+        for job in self.jobs.values():
+            if job["status"] not in FINISHED and "_cancel" in job:
+                job["_cancel"].set()
+        if self.backend is not None:
+            self.backend.shutdown()
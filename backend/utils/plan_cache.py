@@ -0,0 +1,95 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+PLAN_CACHE_SIZE = int(os.environ.get("CARGO_PLAN_CACHE_SIZE", "64"))
+# Unset keeps plans in memory only
+PLAN_CACHE_DIR = os.environ.get("CARGO_PLAN_CACHE_DIR")
+# Bump when the packer changes in a way that makes old plans wrong
+PLAN_FORMAT = 1
+
+
+def plan_key(items, containers, occupancy_version, settings=None):
+    """Stable hash of everything a placement plan depends on
+
+    Items and containers are sorted by id, so the same manifest hashes the same
+    regardless of the order the database returned it in.
+    """
+    payload = {
+        "format": PLAN_FORMAT,
+        "items": sorted(
+            ({k: v for k, v in item.items() if k != "_id"} for item in items),
+            key=lambda item: str(item.get("itemId"))
+        ),
+        "containers": sorted(
+            ({k: v for k, v in c.items() if k != "_id"} for c in containers),
+            key=lambda c: str(c.get("containerId"))
+        ),
+        "occupancyVersion": occupancy_version,
+        "settings": settings or {}
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class PlanCache:
+    """LRU cache of placement plans by content hash, optionally persisted to disk
+
+    Plans on disk survive restarts and are shared by every process pointed at the
+    same directory; the in-memory LRU keeps the hot ones without touching disk.
+    """
+
+    def __init__(self, max_entries=PLAN_CACHE_SIZE, directory=PLAN_CACHE_DIR):
+        self.max_entries = max_entries
+        self.directory = directory
+        self._plans = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        plan = self._plans.get(key)
+        if plan is None and self.directory:
+            try:
+                with open(self._path(key)) as f:
+                    plan = json.load(f)
+            except (OSError, ValueError):
+                plan = None
+            if plan is not None:
+                self._remember(key, plan)
+        if plan is None:
+            self.misses += 1
+            return None
+        self._plans.move_to_end(key)
+        self.hits += 1
+        return plan
+
+    def put(self, key, plan):
+        self._remember(key, plan)
+        if self.directory:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                tmp_path = self._path(key) + ".tmp"
+                with open(tmp_path, "w") as f:
+                    json.dump(plan, f, default=str)
+                os.replace(tmp_path, self._path(key))
+            except OSError as e:
+                print(f"⚠️ Could not persist plan {key[:12]}: {e}")
+
+    def _remember(self, key, plan):
+        self._plans[key] = plan
+        self._plans.move_to_end(key)
+        while len(self._plans) > self.max_entries:
+            self._plans.popitem(last=False)
+
+    def stats(self):
+        return {
+            "entries": len(self._plans),
+            "maxEntries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "persistent": bool(self.directory)
+        }
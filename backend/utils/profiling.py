@@ -0,0 +1,198 @@
+import cProfile
+import hmac
+import io
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+import uuid
+
+try:
+    from pyinstrument import Profiler as SamplingProfiler
+except ImportError:  # sampling mode is optional
+    SamplingProfiler = None
+
+# Profiling stays disabled unless an admin token is configured
+ADMIN_TOKEN = os.environ.get("CARGO_ADMIN_TOKEN")
+PROFILE_DIR = os.environ.get("CARGO_PROFILE_DIR", "profiles")
+
+PROFILE_HEADER = "x-profile"
+PROFILE_QUERY = "profile"
+ADMIN_HEADER = "x-admin-token"
+
+PROFILE_MODES = ("cprofile", "sampling", "memory")
+
+# tracemalloc is process-wide: overlapping memory profiles share one tracing session,
+# started by the first and stopped when the last one finishes
+_tracing = {"users": 0, "owned": False}
+_tracing_lock = threading.Lock()
+
+
+def requested_profile_mode(headers, query_params):
+    """Return the profiling mode asked for by a request, if any"""
+    mode = headers.get(PROFILE_HEADER) or query_params.get(PROFILE_QUERY)
+    if not mode:
+        return None
+    mode = mode.lower()
+    if mode in ("1", "true", "yes"):
+        return "cprofile"
+    return mode
+
+
+def is_admin(headers):
+    """Check the admin token header against CARGO_ADMIN_TOKEN"""
+    token = headers.get(ADMIN_HEADER)
+    if not ADMIN_TOKEN or not token:
+        return False
+    return hmac.compare_digest(token, ADMIN_TOKEN)
+
+
+def _acquire_tracing():
+    with _tracing_lock:
+        if _tracing["users"] == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start(25)
+            _tracing["owned"] = True
+        _tracing["users"] += 1
+
+
+def _release_tracing():
+    with _tracing_lock:
+        _tracing["users"] -= 1
+        if _tracing["users"] == 0 and _tracing["owned"]:
+            # Never stop tracing that someone else (e.g. the benchmarks) started
+            tracemalloc.stop()
+            _tracing["owned"] = False
+
+
+def occupancy_memory_report(containers):
+    """Report occupancy grid memory per container
+
+    Accepts either {containerId: ContainerSpace} or the PriorityBinPacker
+    layout {containerId: {'space': ContainerSpace, ...}}.
+    """
+    report = {}
+    for cid, container in (containers or {}).items():
+        space = container['space'] if isinstance(container, dict) else container
+        grid = getattr(space, 'occupancy', None)
+        if grid is None:
+            continue
+        report[cid] = {
+            'dims': list(space.dims),
+            'gridBytes': int(grid.nbytes),
+            'items': len(space.items)
+        }
+    return report
+
+
+class RequestProfiler:
+    """Runs one request under cProfile, pyinstrument or tracemalloc"""
+
+    def __init__(self, mode, label="", profile_id=None):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode '{mode}', expected one of {PROFILE_MODES}")
+        if mode == "sampling" and SamplingProfiler is None:
+            raise ValueError("Sampling profiles require pyinstrument to be installed")
+        self.mode = mode
+        self.label = label
+        self.profile_id = profile_id or uuid.uuid4().hex[:12]
+        self._profiler = None
+        self._snapshot = None
+        self._tracing = False
+        self._start = None
+        self.elapsed = None
+
+    def start(self):
+        if self.mode == "cprofile":
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        elif self.mode == "sampling":
+            self._profiler = SamplingProfiler(async_mode="enabled")
+            self._profiler.start()
+        else:
+            _acquire_tracing()
+            self._tracing = True
+            self._snapshot = tracemalloc.take_snapshot()
+        self._start = time.perf_counter()
+
+    def stop(self, containers=None):
+        """Stop profiling, write the results to PROFILE_DIR and return the summary text
+
+        containers ({containerId: ContainerSpace}, or a function returning them) feed
+        the occupancy grid section of memory profiles; a function is only called after
+        the final snapshot, so its own allocations are not reported. Returns None if
+        start() never completed.
+        """
+        if self._start is None:
+            if self._tracing:
+                _release_tracing()
+                self._tracing = False
+            return None
+        self.elapsed = time.perf_counter() - self._start
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        base = os.path.join(PROFILE_DIR, self.profile_id)
+        header = f"{self.label} [{self.mode}] {self.elapsed * 1000:.1f} ms\n\n"
+
+        if self.mode == "cprofile":
+            self._profiler.disable()
+            self._profiler.dump_stats(f"{base}.prof")
+            out = io.StringIO()
+            pstats.Stats(self._profiler, stream=out).sort_stats("cumulative").print_stats(40)
+            summary = out.getvalue()
+        elif self.mode == "sampling":
+            self._profiler.stop()
+            with open(f"{base}.html", "w") as f:
+                f.write(self._profiler.output_html())
+            summary = self._profiler.output_text()
+        else:
+            try:
+                snapshot = tracemalloc.take_snapshot()
+            finally:
+                _release_tracing()
+                self._tracing = False
+            summary = self._memory_summary(snapshot, containers() if callable(containers) else containers)
+
+        with open(f"{base}.txt", "w") as f:
+            f.write(header + summary)
+        print(f"🔬 Stored {self.mode} profile {self.profile_id} for {self.label}")
+        return header + summary
+
+    def _memory_summary(self, snapshot, containers):
+        # Allocations of requests profiled at the same time show up here too
+        lines = ["Top allocations during request:"]
+        for stat in snapshot.compare_to(self._snapshot, "lineno")[:25]:
+            lines.append(f"  {stat}")
+
+        grids = occupancy_memory_report(containers)
+        if grids:
+            total = sum(g['gridBytes'] for g in grids.values())
+            lines.append("")
+            lines.append(f"Occupancy grids (latest snapshot): {len(grids)} containers, {total / 1024:.1f} KiB")
+            for cid, grid in sorted(grids.items(), key=lambda g: -g[1]['gridBytes']):
+                dims = "x".join(str(d) for d in grid['dims'])
+                lines.append(f"  {cid}: {dims} -> {grid['gridBytes'] / 1024:.1f} KiB, {grid['items']} items")
+        return "\n".join(lines) + "\n"
+
+
+def run_profiled(mode, label, profile_id, fn, *args, **kwargs):
+    """Call fn(*args, **kwargs) under a profiler and store it as profile_id
+
+    Lets a job worker profile the work itself rather than the request that queued it.
+    """
+    profiler = RequestProfiler(mode, label=label, profile_id=profile_id)
+    try:
+        profiler.start()
+        return fn(*args, **kwargs)
+    finally:
+        profiler.stop()
+
+
+def load_profile(profile_id):
+    """Read a stored profile summary, or None if it does not exist"""
+    if not profile_id.isalnum():
+        return None
+    path = os.path.join(PROFILE_DIR, f"{profile_id}.txt")
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return f.read()
@@ -0,0 +1,38 @@
+import json
+import os
+from datetime import date, datetime
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # the standard library encoder is used instead
+    orjson = None
+
+# Responses at least this large are gzipped for clients that accept it; 0 turns compression off
+COMPRESS_MIN_BYTES = int(os.environ.get("CARGO_COMPRESS_MIN_BYTES", "1024"))
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if hasattr(value, "tolist"):  # NumPy arrays and scalars
+        return value.tolist()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    return str(value)  # ObjectId and other driver types
+
+
+def dumps(content):
+    """Encode content as JSON bytes; datetimes, NumPy values and ObjectIds are handled natively"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default,
+                            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, separators=(",", ":")).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when it is installed"""
+
+    def render(self, content):
+        return dumps(content)
@@ -2,22 +2,95 @@ document.addEventListener("DOMContentLoaded", function () {
     fetchCargoData();
 });
 
-function fetchCargoData() {
-    fetch("http://127.0.0.1:8000/api/items")
-        .then(response => response.json())
-        .then(data => {
-            const cargoTable = document.getElementById("cargoTable");
-            cargoTable.innerHTML = "";
-            data.data.forEach(item => {
-                const row = `<tr>
+const ITEMS_URL = "http://127.0.0.1:8000/api/items";
+const CHANGES_URL = "http://127.0.0.1:8000/api/changes/stream";
+const ITEM_FIELDS = "itemId,name,preferredZone,priority,status";
+const PAGE_SIZE = 500;
+
+// ETag per page cursor, so unchanged pages are answered with 304
+const pageCache = {};
+
+function fetchPage(cursor) {
+    const params = new URLSearchParams({ limit: PAGE_SIZE, fields: ITEM_FIELDS });
+    if (cursor) params.set("cursor", cursor);
+    const key = cursor || "";
+    const cached = pageCache[key];
+    const headers = cached ? { "If-None-Match": cached.etag } : {};
+
+    return fetch(`${ITEMS_URL}?${params}`, { headers })
+        .then(response => {
+            // Where the change stream resumes from, read before this page was
+            const changeCursor = response.headers.get("X-Change-Cursor");
+            if (response.status === 304) return { ...cached.data, changeCursor };
+            return response.json().then(data => {
+                pageCache[key] = { etag: response.headers.get("ETag"), data };
+                return { ...data, changeCursor };
+            });
+        });
+}
+
+function renderRow(item) {
+    return `<tr data-item-id="${item.itemId}">
                     <td>${item.itemId}</td>
                     <td>${item.name}</td>
                     <td>${item.preferredZone || 'N/A'}</td>
                     <td>${item.priority}</td>
-                    <td>${item.status}</td>
+                    <td data-field="status">${item.status}</td>
                 </tr>`;
-                cargoTable.innerHTML += row;
-            });
-        })
-        .catch(error => console.error("Error fetching cargo:", error));
-}
\ No newline at end of file
+}
+
+function renderRows(items) {
+    return items.map(renderRow).join("");
+}
+
+// Apply one change event to the table instead of re-fetching the whole list
+function applyChange(event) {
+    const cargoTable = document.getElementById("cargoTable");
+    const change = JSON.parse(event.data);
+    if (change.type === "resync") {
+        // Reload, then stream again from where the reload started
+        changeStream.close();
+        changeStream = null;
+        fetchCargoData();
+        return;
+    }
+    if (!change.itemId) return;
+
+    const row = cargoTable.querySelector(`tr[data-item-id="${CSS.escape(change.itemId)}"]`);
+    if (change.type === "item.imported") {
+        if (!row) cargoTable.insertAdjacentHTML("beforeend", renderRow({ itemId: change.itemId, ...change.data }));
+    } else if (row && change.data.status) {
+        row.querySelector('[data-field="status"]').textContent = change.data.status;
+    }
+}
+
+let changeStream = null;
+
+function subscribeToChanges(since) {
+    if (changeStream) return;
+    // EventSource reconnects by itself and resumes with Last-Event-ID
+    const url = since ? `${CHANGES_URL}?since=${encodeURIComponent(since)}` : CHANGES_URL;
+    changeStream = new EventSource(url);
+    ["item.imported", "item.placed", "item.retrieved", "item.wasted", "resync"].forEach(type =>
+        changeStream.addEventListener(type, applyChange)
+    );
+}
+
+async function fetchCargoData() {
+    const cargoTable = document.getElementById("cargoTable");
+    try {
+        let rows = "";
+        let cursor = null;
+        let since = null;
+        do {
+            const page = await fetchPage(cursor);
+            since = since || page.changeCursor;
+            rows += renderRows(page.data);
+            cursor = page.nextCursor;
+        } while (cursor);
+        cargoTable.innerHTML = rows;
+        subscribeToChanges(since);
+    } catch (error) {
+        console.error("Error fetching cargo:", error);
+    }
+}